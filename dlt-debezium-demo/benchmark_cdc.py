@@ -0,0 +1,134 @@
+"""
+End-to-end benchmark of the CDC runtime with a fake event source.
+
+Generates change events shaped like the ones Debezium emits for each connector
+profile, hands them to `DltChangeHandler` the way the engine does and measures
+how fast `process_queue` loads them into a local DuckDB database. No source
+database is needed, so batching, compaction and parallel loading settings
+from `[cdc_settings]` in .dlt/config.toml can be compared for both connectors.
+
+    python benchmark_cdc.py                 # all profiles
+    python benchmark_cdc.py mysql 200000    # one profile, number of events
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterator, List
+
+import dlt
+
+from cdc_runtime import DltChangeHandler, event_queue, process_queue
+from connector_profiles import PROFILES, ConnectorProfile
+
+EVENTS_COUNT = 100000
+# Events per handler call, Debezium default max.batch.size
+BATCH_SIZE = 2048
+TABLES = ["customers", "orders", "order_items", "payments"]
+# Rows per table, events update the same rows over and over
+ROWS_PER_TABLE = 5000
+
+
+class FakeChangeEvent:
+    """Quacks like the `ChangeEvent` passed by the Debezium engine."""
+
+    def __init__(self, key: str, value: str, destination: str):
+        self._key = key
+        self._value = value
+        self._destination = destination
+
+    def key(self) -> str:
+        return self._key
+
+    def value(self) -> str:
+        return self._value
+
+    def destination(self) -> str:
+        return self._destination
+
+
+def fake_source(profile: ConnectorProfile, idx: int, table: str) -> Dict[str, Any]:
+    """`source` block of a change event with a position of the connector's log."""
+    source = {"connector": profile.name, "db": "benchmark", "table": table, "ts_ms": int(time.time() * 1000)}
+    fields = [field for field, _ in profile.position_fields]
+    if fields == ["lsn"]:
+        source.update({"schema": "public", "lsn": 1000 + idx})
+    else:
+        positions = dict(zip(fields, ("mysql-bin.000001", 4 + idx * 100, 0)))
+        source.update(positions)
+    return source
+
+
+def fake_events(profile: ConnectorProfile, count: int) -> Iterator[FakeChangeEvent]:
+    for idx in range(count):
+        table = TABLES[idx % len(TABLES)]
+        row_id = (idx // len(TABLES)) % ROWS_PER_TABLE
+        op = "c" if idx < len(TABLES) * ROWS_PER_TABLE else "u"
+        row = {"id": row_id, "name": f"{table} {row_id}", "amount": idx / 100, "version": idx}
+        payload = {
+            "before": None,
+            "after": row,
+            "source": fake_source(profile, idx, table),
+            "op": op,
+            "ts_ms": int(time.time() * 1000),
+        }
+        yield FakeChangeEvent(
+            key=json.dumps({"payload": {"id": row_id}}),
+            value=json.dumps({"payload": payload}),
+            destination=f"benchmark.{table}",
+        )
+
+
+def run(profile: ConnectorProfile, events_count: int = EVENTS_COUNT) -> float:
+    """Return events per second loaded by the CDC runtime for the profile."""
+    events = list(fake_events(profile, events_count))
+    primary_keys = {table: "id" for table in TABLES}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pipeline = dlt.pipeline(
+            pipeline_name=f"benchmark_{profile.name}",
+            pipelines_dir=tmp_dir,
+            destination=dlt.destinations.duckdb(os.path.join(tmp_dir, "benchmark.duckdb")),
+            dataset_name=profile.dataset_name,
+        )
+        stop_event = threading.Event()
+        consumer = threading.Thread(
+            target=process_queue,
+            args=(pipeline, primary_keys, stop_event),
+            kwargs={"position_fields": profile.position_fields},
+            name="CdcBenchmarkConsumer",
+        )
+        consumer.daemon = True
+        handler = DltChangeHandler()
+
+        started_at = time.perf_counter()
+        consumer.start()
+        for start in range(0, len(events), BATCH_SIZE):
+            handler.handleJsonBatch(events[start:start + BATCH_SIZE])
+        # All queued batches loaded
+        event_queue.join()
+        elapsed = time.perf_counter() - started_at
+
+        stop_event.set()
+        consumer.join()
+
+        with pipeline.sql_client() as client:
+            loaded = client.execute_sql(
+                " UNION ALL ".join(f"SELECT COUNT(*) FROM {table}" for table in TABLES)
+            )
+        rows = sum(count for (count,) in loaded)
+        expected = min(events_count, len(TABLES) * ROWS_PER_TABLE)
+        assert rows == expected, f"Expected {expected} rows, got {rows}"
+
+    return events_count / elapsed
+
+
+if __name__ == "__main__":
+    names: List[str] = [sys.argv[1]] if len(sys.argv) > 1 else list(PROFILES)
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else EVENTS_COUNT
+
+    for name in names:
+        events_per_second = run(PROFILES[name], count)
+        print(f"{PROFILES[name].title}: {events_per_second:,.0f} events/sec ({count} events)")
@@ -0,0 +1,126 @@
+"""
+Micro-benchmark: events/sec of parsing Debezium change events.
+
+Compares the stdlib json decoder (previous `parse_event` behaviour) with
+the fast decode path using orjson / msgspec when they are installed.
+
+    python benchmark_decode.py
+"""
+import json
+import time
+from typing import Any, Dict, List
+
+from cdc_runtime import EventDecoder, msgspec, orjson, parse_event
+
+EVENTS_COUNT = 100000
+TOPIC = "mydb.public.test_users"
+
+COLUMNS = [
+    ("id", "int32", None),
+    ("name", "string", None),
+    ("email", "string", None),
+    ("age", "int16", None),
+    ("score", "float64", None),
+    ("active", "boolean", None),
+    ("created_at", "int64", "io.debezium.time.MicroTimestamp"),
+    ("birthday", "int32", "io.debezium.time.Date"),
+]
+
+
+def row_schema(name: str, field: str) -> Dict[str, Any]:
+    fields = []
+    for column, column_type, logical_name in COLUMNS:
+        column_schema = {"type": column_type, "optional": column != "id", "field": column}
+        if logical_name:
+            column_schema.update({"name": logical_name, "version": 1})
+        fields.append(column_schema)
+    return {"type": "struct", "fields": fields, "optional": True, "name": name, "field": field}
+
+
+def make_records(count: int) -> List[Dict[str, Any]]:
+    """Debezium envelopes with `value.converter.schemas.enable` on."""
+    schema = {
+        "type": "struct",
+        "fields": [
+            row_schema(f"{TOPIC}.Value", "before"),
+            row_schema(f"{TOPIC}.Value", "after"),
+            {
+                "type": "struct",
+                "fields": [
+                    {"type": "string", "optional": False, "field": field}
+                    for field in ("version", "connector", "name", "db", "schema", "table")
+                ] + [
+                    {"type": "int64", "optional": False, "field": "ts_ms"},
+                    {"type": "int64", "optional": True, "field": "lsn"},
+                ],
+                "optional": False,
+                "name": "io.debezium.connector.postgresql.Source",
+                "field": "source",
+            },
+            {"type": "string", "optional": False, "field": "op"},
+            {"type": "int64", "optional": True, "field": "ts_ms"},
+        ],
+        "optional": False,
+        "name": f"{TOPIC}.Envelope",
+        "version": 2,
+    }
+
+    records = []
+    for idx in range(count):
+        after = {
+            "id": idx,
+            "name": f"user {idx}",
+            "email": f"user{idx}@example.com",
+            "age": idx % 90,
+            "score": idx / 7,
+            "active": idx % 2 == 0,
+            "created_at": 1700000000000000 + idx,
+            "birthday": 10000 + idx % 1000,
+        }
+        payload = {
+            "before": None,
+            "after": after,
+            "source": {
+                "version": "2.7.0.Final",
+                "connector": "postgresql",
+                "name": "mydb",
+                "db": "mydb",
+                "schema": "public",
+                "table": "test_users",
+                "ts_ms": 1700000000000,
+                "lsn": 1000 + idx,
+            },
+            "op": "c",
+            "ts_ms": 1700000000000,
+        }
+        records.append({
+            "key": json.dumps({"payload": {"id": idx}}),
+            "value": json.dumps({"schema": schema, "payload": payload}),
+            "destination": TOPIC,
+        })
+    return records
+
+
+def measure(records: List[Dict[str, Any]], decoder: EventDecoder) -> float:
+    """Return events per second parsed with the given decoder."""
+    started_at = time.perf_counter()
+    parsed = sum(1 for record in records if parse_event(record, decoder))
+    elapsed = time.perf_counter() - started_at
+
+    assert parsed == len(records), f"Expected {len(records)} events, got {parsed}"
+    return parsed / elapsed
+
+
+if __name__ == "__main__":
+    records = make_records(EVENTS_COUNT)
+    print(f"Event size: {len(records[0]['value'])} bytes, {EVENTS_COUNT} events")
+
+    baseline = measure(records, EventDecoder("json"))
+    print(f"json:    {baseline:,.0f} events/sec")
+
+    for library, module in (("orjson", orjson), ("msgspec", msgspec)):
+        if module is None:
+            print(f"{library}: not installed")
+            continue
+        events_per_second = measure(records, EventDecoder(library))
+        print(f"{library}: {events_per_second:,.0f} events/sec ({events_per_second / baseline:.1f}x)")
@@ -0,0 +1,257 @@
+"""
+Bulk initial snapshot for the CDC loaders.
+
+Instead of streaming every existing row through Debezium as an `op='r'` event,
+existing tables are copied directly with dlt's `sql_database` source (chunked,
+parallel, pyarrow backend). The replication slot is created with an exported snapshot
+and the copy reads the tables in that snapshot, so it contains exactly the changes
+before the slot's position. Debezium then streams from that slot without snapshotting data.
+"""
+import json
+import logging
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote_plus
+
+import dlt
+
+from config_helper_universal import BASE_PATH, offsets_file_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 100000
+# Debezium snapshot mode after the bulk copy: stream from the slot, no data snapshot
+# (called `never` before Debezium 2.6)
+STREAMING_SNAPSHOT_MODE = "no_data"
+
+TABLE_NAME_PATTERN = re.compile(r"^\w+\.\w+$")
+
+
+def snapshot_marker_path(connector_type: str) -> Path:
+    """File recording a finished bulk snapshot and its log position."""
+    return BASE_PATH / "tmp" / f"bulk_snapshot_{connector_type}.json"
+
+
+def bulk_snapshot_needed(connector_type: str) -> bool:
+    """Bulk snapshot runs only before Debezium streamed anything."""
+    return not snapshot_marker_path(connector_type).exists() and not offsets_file_path(connector_type).exists()
+
+
+def snapshot_tables(extra_conf: Dict[str, Any]) -> List[str]:
+    """
+    Tables to copy as `schema.table`: `cdc_settings.bulk_snapshot_tables` or the
+    Debezium `table_include_list` if it lists plain table names.
+    """
+    tables = dlt.config.get("cdc_settings.bulk_snapshot_tables")
+    if not tables:
+        tables = [name.strip() for name in extra_conf.get("table_include_list", "").split(",") if name.strip()]
+
+    if not tables or not all(TABLE_NAME_PATTERN.match(name) for name in tables):
+        raise ValueError(
+            "Bulk snapshot needs plain `schema.table` names: set cdc_settings.bulk_snapshot_tables"
+        )
+    return list(tables)
+
+
+def postgres_credentials(db_conf: Dict[str, Any]) -> str:
+    """SQLAlchemy connection string for the `sql_database` source."""
+    user = db_conf.get("username", db_conf.get("user", ""))
+    password = quote_plus(str(db_conf.get("password", "")))
+    host = db_conf.get("host", "localhost")
+    port = db_conf.get("port", 5432)
+    database = db_conf.get("database", db_conf.get("dbname", ""))
+    return f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{database}"
+
+
+def postgres_connect(db_conf: Dict[str, Any], **kwargs: Any) -> Any:
+    """psycopg2 connection to the source database."""
+    import psycopg2
+
+    return psycopg2.connect(
+        host=db_conf.get("host", "localhost"),
+        port=db_conf.get("port", 5432),
+        user=db_conf.get("username", db_conf.get("user", "")),
+        password=db_conf.get("password", ""),
+        dbname=db_conf.get("database", db_conf.get("dbname", "")),
+        **kwargs,
+    )
+
+
+def ensure_publication(db_conf: Dict[str, Any], publication_name: str, tables: List[str]) -> None:
+    """
+    Create the publication Debezium streams (if missing) for `tables`. It must exist
+    before the slot: pgoutput looks it up as of the position of each change.
+    """
+    from psycopg2 import sql
+
+    conn = postgres_connect(db_conf)
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1 FROM pg_publication WHERE pubname = %s", (publication_name,))
+            if cur.fetchone():
+                return
+            cur.execute(
+                sql.SQL("CREATE PUBLICATION {} FOR TABLE {}").format(
+                    sql.Identifier(publication_name),
+                    sql.SQL(", ").join(sql.Identifier(*name.split(".")) for name in tables),
+                )
+            )
+            logger.info(f"📢 Created publication {publication_name} for {len(tables)} tables")
+    finally:
+        conn.close()
+
+
+@contextmanager
+def replication_slot_snapshot(db_conf: Dict[str, Any], slot_name: str) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Create the logical replication slot Debezium will use (if missing) and export the
+    database snapshot at its position. Yields the LSN from which Debezium will stream
+    changes and the snapshot name, which can be imported while the context is open.
+    The snapshot name is None if the slot already existed.
+    """
+    import psycopg2.extras
+
+    conn = postgres_connect(db_conf)
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT COALESCE(confirmed_flush_lsn, restart_lsn) FROM pg_replication_slots WHERE slot_name = %s",
+                (slot_name,),
+            )
+            row = cur.fetchone()
+    finally:
+        conn.close()
+    if row:
+        logger.warning(
+            f"Replication slot {slot_name} exists, copying without its snapshot: "
+            "changes since its position are replayed on top of the copy"
+        )
+        yield str(row[0]), None
+        return
+
+    # The exported snapshot lives as long as this connection runs no other command
+    conn = postgres_connect(db_conf, connection_factory=psycopg2.extras.LogicalReplicationConnection)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f'CREATE_REPLICATION_SLOT "{slot_name}" LOGICAL pgoutput EXPORT_SNAPSHOT')
+            _, position, snapshot_name, _ = cur.fetchone()
+        yield str(position), snapshot_name
+    finally:
+        conn.close()
+
+
+def snapshot_engine(db_conf: Dict[str, Any], snapshot_name: Optional[str]) -> Any:
+    """
+    SQLAlchemy engine for the `sql_database` source. Every transaction imports
+    `snapshot_name`, so all tables and chunks are read as of the slot's position.
+    """
+    import sqlalchemy as sa
+
+    if not snapshot_name:
+        return sa.create_engine(postgres_credentials(db_conf))
+
+    engine = sa.create_engine(postgres_credentials(db_conf), isolation_level="REPEATABLE READ")
+
+    @sa.event.listens_for(engine, "begin")
+    def import_snapshot(conn: Any) -> None:
+        conn.exec_driver_sql(f"SET TRANSACTION SNAPSHOT '{snapshot_name}'")
+
+    return engine
+
+
+def add_cdc_columns(table_name: str, merge: bool) -> Callable[[Any], Any]:
+    """Add CDC metadata columns to snapshot chunks, rows look like `op='r'` events."""
+    def _add(table: Any) -> Any:
+        from dlt.common.libs.pyarrow import pyarrow as pa
+
+        rows = table.num_rows
+        table = table.append_column("__table", pa.repeat(table_name, rows))
+        if merge:
+            return table.append_column("__deleted", pa.repeat(False, rows))
+        return table.append_column("__op", pa.repeat("r", rows))
+
+    return _add
+
+
+def run_bulk_snapshot(
+    pipeline: dlt.Pipeline,
+    connector_type: str,
+    db_config_section: str,
+    primary_keys: Dict[str, str],
+) -> str:
+    """
+    Copy existing tables into the destination and record the log position.
+    Returns the position Debezium has to stream from.
+    """
+    if connector_type != "postgres":
+        raise ValueError(
+            "Bulk snapshot is supported for PostgreSQL only: Debezium can't be started "
+            "from a recorded binlog position. Use snapshot_mode in sources.debezium instead."
+        )
+
+    from dlt.sources.sql_database import sql_database
+
+    db_conf = dlt.secrets.get(db_config_section) or dlt.secrets.get("sources.debezium")
+    extra_conf = dlt.secrets.get("sources.debezium", {})
+    tables = snapshot_tables(extra_conf)
+    chunk_size = int(dlt.config.get("cdc_settings.bulk_snapshot_chunk_size") or DEFAULT_CHUNK_SIZE)
+
+    # 1. Publication first, Debezium decodes changes from the slot's position with it
+    ensure_publication(db_conf, extra_conf.get("publication_name", "debezium_pub"), tables)
+
+    # 2. Record position: slot keeps all changes made from now on
+    slot_name = extra_conf.get("slot_name", "debezium_slot")
+    with replication_slot_snapshot(db_conf, slot_name) as (position, snapshot_name):
+        logger.info(
+            f"📍 Replication slot {slot_name} at {position} (snapshot {snapshot_name}), copying {len(tables)} tables"
+        )
+
+        # 3. Copy tables (chunked, parallel, Arrow) as of the slot's position
+        tables_by_schema = defaultdict(list)
+        for name in tables:
+            schema_name, table_name = name.split(".")
+            tables_by_schema[schema_name].append(table_name)
+
+        engine = snapshot_engine(db_conf, snapshot_name)
+        resources = []
+        for schema_name, table_names in tables_by_schema.items():
+            source = sql_database(
+                engine,
+                schema=schema_name,
+                table_names=table_names,
+                backend="pyarrow",
+                chunk_size=chunk_size,
+            )
+            for table_name in table_names:
+                primary_key = primary_keys.get(table_name)
+                resource = source.resources[table_name].parallelize()
+                resource.add_map(add_cdc_columns(table_name, bool(primary_key)))
+                # Snapshot is the initial state of the table, CDC merges/appends on top of it
+                resource.apply_hints(write_disposition="replace")
+                if primary_key:
+                    resource.apply_hints(primary_key=primary_key)
+                resources.append(resource)
+
+        started_at = time.monotonic()
+        try:
+            load_info = pipeline.run(resources)
+        finally:
+            engine.dispose()
+        logger.info(f"✅ Bulk snapshot loaded in {time.monotonic() - started_at:.1f}s: {load_info}")
+
+    # 4. Remember the snapshot, restarts stream from Debezium offsets
+    marker = snapshot_marker_path(connector_type)
+    marker.parent.mkdir(exist_ok=True)
+    marker.write_text(json.dumps({
+        "slot_name": slot_name,
+        "position": position,
+        "tables": tables,
+        "loaded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }))
+    return position
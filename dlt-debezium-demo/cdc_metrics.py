@@ -0,0 +1,239 @@
+"""
+Lag and throughput metrics of the CDC runtime.
+
+Metrics are kept in memory and exposed in Prometheus text format on a local
+HTTP endpoint (`GET /metrics`), enabled with `metrics_port` in `[cdc_settings]`.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of histogram buckets
+SIZE_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+# Seconds over which cdc_events_per_second is averaged
+RATE_WINDOW_SECONDS = 60.0
+
+
+class Histogram:
+    """Prometheus style histogram with cumulative buckets."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[idx] += 1
+
+    def render(self, name: str, labels: str = "") -> List[str]:
+        sep = "," if labels else ""
+        lines = [
+            f'{name}_bucket{{{labels}{sep}le="{bound}"}} {count}'
+            for bound, count in zip(self.buckets, self.counts)
+        ]
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.total}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+class CdcMetrics:
+    """
+    Counters, gauges and histograms of the CDC runtime.
+    Updated from the Debezium handler, parse and load threads, so every update takes a lock.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.events_received = 0
+        # (time, events) of Debezium batches received within the rate window
+        self.received_window: Deque[Tuple[float, int]] = deque()
+        self.events_taken = 0
+        self.batches_loaded = 0
+        self.load_failures = 0
+        self.parse_failures = 0
+        self.decode_errors = 0
+        self.batch_events = Histogram(SIZE_BUCKETS)
+        self.parse_seconds = Histogram(DURATION_BUCKETS)
+        self.load_seconds = Histogram(DURATION_BUCKETS)
+        # per table
+        self.rows_loaded: Dict[str, int] = {}
+        self.lag_seconds: Dict[str, float] = {}
+        self.last_loaded_at: Dict[str, float] = {}
+        self.lag_histograms: Dict[str, Histogram] = {}
+        # Debezium batches waiting in the event queue, sampled when rendered
+        self.queue_batches: Callable[[], int] = lambda: 0
+
+    def record_received(self, events: int) -> None:
+        received_at = time.time()
+        with self.lock:
+            self.events_received += events
+            self.received_window.append((received_at, events))
+            self._expire_received(received_at)
+
+    def _expire_received(self, now: float) -> None:
+        # called under the lock
+        while self.received_window and self.received_window[0][0] <= now - RATE_WINDOW_SECONDS:
+            self.received_window.popleft()
+
+    def events_per_second(self, now: float) -> float:
+        """Received events per second over the last RATE_WINDOW_SECONDS, called under the lock."""
+        self._expire_received(now)
+        window = min(max(now - self.started_at, 1e-9), RATE_WINDOW_SECONDS)
+        return sum(events for _, events in self.received_window) / window
+
+    def record_batch(self, events: int) -> None:
+        """A micro-batch was taken from the event queue."""
+        with self.lock:
+            self.events_taken += events
+            self.batch_events.observe(events)
+
+    def record_parse(self, seconds: float, parsed: bool = True) -> None:
+        with self.lock:
+            self.parse_seconds.observe(seconds)
+            if not parsed:
+                self.parse_failures += 1
+
+    def record_decode_errors(self, events: int) -> None:
+        """Change events skipped because they couldn't be decoded."""
+        with self.lock:
+            self.decode_errors += events
+
+    def record_load(
+        self,
+        seconds: float,
+        rows_by_table: Dict[str, int],
+        source_ts_by_table: Dict[str, float],
+        loaded: bool,
+    ) -> None:
+        """
+        A batch (or its part) was loaded. Replication lag of a table is the time
+        between the source commit of its newest loaded change and the load commit.
+        """
+        loaded_at = time.time()
+        with self.lock:
+            self.load_seconds.observe(seconds)
+            if not loaded:
+                self.load_failures += 1
+                return
+            self.batches_loaded += 1
+            for table_name, rows in rows_by_table.items():
+                self.rows_loaded[table_name] = self.rows_loaded.get(table_name, 0) + rows
+                self.last_loaded_at[table_name] = loaded_at
+                source_ts = source_ts_by_table.get(table_name)
+                if source_ts:
+                    lag = max(loaded_at - source_ts, 0.0)
+                    self.lag_seconds[table_name] = lag
+                    self.lag_histograms.setdefault(table_name, Histogram(DURATION_BUCKETS)).observe(lag)
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format."""
+        queue_batches = self.queue_batches()
+        with self.lock:
+            lines = [
+                "# HELP cdc_events_received_total Change events handed over by Debezium.",
+                "# TYPE cdc_events_received_total counter",
+                f"cdc_events_received_total {self.events_received}",
+                f"# HELP cdc_events_per_second Received change events per second over the last {RATE_WINDOW_SECONDS:.0f}s.",
+                "# TYPE cdc_events_per_second gauge",
+                f"cdc_events_per_second {self.events_per_second(time.time())}",
+                "# HELP cdc_event_queue_events Change events waiting in the event queue.",
+                "# TYPE cdc_event_queue_events gauge",
+                f"cdc_event_queue_events {self.events_received - self.events_taken}",
+                "# HELP cdc_event_queue_batches Debezium batches waiting in the event queue.",
+                "# TYPE cdc_event_queue_batches gauge",
+                f"cdc_event_queue_batches {queue_batches}",
+                "# HELP cdc_batches_loaded_total Loads committed to the destination.",
+                "# TYPE cdc_batches_loaded_total counter",
+                f"cdc_batches_loaded_total {self.batches_loaded}",
+                "# HELP cdc_load_failures_total Failed loads.",
+                "# TYPE cdc_load_failures_total counter",
+                f"cdc_load_failures_total {self.load_failures}",
+                "# HELP cdc_parse_failures_total Micro-batches which failed to parse and were not loaded.",
+                "# TYPE cdc_parse_failures_total counter",
+                f"cdc_parse_failures_total {self.parse_failures}",
+                "# HELP cdc_decode_errors_total Change events skipped because they couldn't be decoded.",
+                "# TYPE cdc_decode_errors_total counter",
+                f"cdc_decode_errors_total {self.decode_errors}",
+                "# HELP cdc_batch_events Change events per micro-batch.",
+                "# TYPE cdc_batch_events histogram",
+                *self.batch_events.render("cdc_batch_events"),
+                "# HELP cdc_parse_duration_seconds Time to parse, group and compact a micro-batch.",
+                "# TYPE cdc_parse_duration_seconds histogram",
+                *self.parse_seconds.render("cdc_parse_duration_seconds"),
+                "# HELP cdc_load_duration_seconds Time of extract, normalize and load of a micro-batch.",
+                "# TYPE cdc_load_duration_seconds histogram",
+                *self.load_seconds.render("cdc_load_duration_seconds"),
+                "# HELP cdc_rows_loaded_total Rows loaded per table (after compaction).",
+                "# TYPE cdc_rows_loaded_total counter",
+            ]
+            lines.extend(
+                f'cdc_rows_loaded_total{{table="{table}"}} {rows}' for table, rows in sorted(self.rows_loaded.items())
+            )
+            lines.extend([
+                "# HELP cdc_last_load_timestamp_seconds Unix time of the last load per table.",
+                "# TYPE cdc_last_load_timestamp_seconds gauge",
+            ])
+            lines.extend(
+                f'cdc_last_load_timestamp_seconds{{table="{table}"}} {loaded_at}'
+                for table, loaded_at in sorted(self.last_loaded_at.items())
+            )
+            lines.extend([
+                "# HELP cdc_replication_lag_seconds Source commit to load commit time of the newest loaded change.",
+                "# TYPE cdc_replication_lag_seconds gauge",
+            ])
+            lines.extend(
+                f'cdc_replication_lag_seconds{{table="{table}"}} {lag}' for table, lag in sorted(self.lag_seconds.items())
+            )
+            lines.extend([
+                "# HELP cdc_replication_lag_distribution_seconds Replication lag per load and table.",
+                "# TYPE cdc_replication_lag_distribution_seconds histogram",
+            ])
+            for table, histogram in sorted(self.lag_histograms.items()):
+                lines.extend(histogram.render("cdc_replication_lag_distribution_seconds", f'table="{table}"'))
+        return "\n".join(lines) + "\n"
+
+
+def start_metrics_server(metrics: CdcMetrics, port: int, host: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """Serve `metrics` on http://host:port/metrics from a background thread."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    try:
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError as e:
+        logger.error(f"❌ Could not start metrics endpoint on {host}:{port}: {e}")
+        return None
+
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="CdcMetricsServer")
+    thread.daemon = True
+    thread.start()
+    logger.info(f"📈 Metrics endpoint: http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,1101 @@
+"""
+CDC runtime: Debezium + dlt Integration
+
+Shared by all CDC loaders. Captures changes using Embedded Debezium Engine and loads them into dlt,
+connector-specific settings come from a `ConnectorProfile` (see `connector_profiles.py`).
+"""
+import base64
+import json
+import logging
+import os
+import signal
+import sys
+import time
+import queue
+import threading
+import zlib
+from collections import defaultdict
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Any, Tuple
+
+import dlt
+from dlt.common.destination import Destination
+from dlt.common.time import ensure_pendulum_datetime
+from pydbzengine import BasePythonChangeHandler, ChangeEvent, DebeziumJsonEngine, Properties
+
+# Optional faster JSON decoders
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from bulk_snapshot import STREAMING_SNAPSHOT_MODE, bulk_snapshot_needed, run_bulk_snapshot
+from cdc_metrics import CdcMetrics, start_metrics_server
+from config_helper_universal import generate_debezium_properties_file
+from connector_profiles import ConnectorProfile
+
+
+def setup_logging():
+    """Configure logging for the CDC pipeline."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+
+logger = logging.getLogger(__name__)
+
+# Global thread-safe queue for decoupling Java callbacks from Python execution
+event_queue = queue.Queue()
+
+# Lag and throughput metrics, exposed on an HTTP endpoint if `metrics_port` is set
+metrics = CdcMetrics()
+metrics.queue_batches = event_queue.qsize
+
+# Micro-batch window defaults (override in [cdc_settings] of .dlt/config.toml)
+DEFAULT_MAX_BATCH_ROWS = 50000
+DEFAULT_MAX_BATCH_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_BATCH_LATENCY = 5.0
+# Parsed batches allowed to wait for the load stage
+DEFAULT_PIPELINE_DEPTH = 2
+
+# Serializes the first load of each worker pipeline, which creates the dataset and dlt tables
+worker_init_lock = threading.Lock()
+# DuckDB database file → lock held by worker pipelines while they write to it
+destination_locks: Dict[str, threading.Lock] = {}
+
+
+class BatchWindow(NamedTuple):
+    """Limits of one coalesced load: whichever is reached first closes the batch."""
+    max_rows: int
+    max_bytes: int
+    max_latency: float
+
+
+def get_cdc_setting(name: str, default: Any) -> Any:
+    """Read `cdc_settings.<name>` from dlt config, falling back to default."""
+    value = dlt.config.get(f"cdc_settings.{name}")
+    return default if value is None else value
+
+
+def load_batch_window() -> BatchWindow:
+    """Micro-batch window from `cdc_settings` in .dlt/config.toml."""
+    return BatchWindow(
+        max_rows=int(get_cdc_setting("max_batch_rows", DEFAULT_MAX_BATCH_ROWS)),
+        max_bytes=int(get_cdc_setting("max_batch_bytes", DEFAULT_MAX_BATCH_BYTES)),
+        max_latency=float(get_cdc_setting("max_batch_latency", DEFAULT_MAX_BATCH_LATENCY)),
+    )
+
+
+class LoadAck:
+    """Lets the Debezium handler wait until its records were loaded (`commit_after_load` mode)."""
+
+    def __init__(self):
+        self.loaded = threading.Event()
+        self.error: Optional[str] = None
+
+    def done(self, error: Optional[str] = None) -> None:
+        self.error = error
+        self.loaded.set()
+
+
+class DltChangeHandler(BasePythonChangeHandler):
+    """
+    Handles Debezium change events.
+    OPTIMIZATION: Batches all table loads into a single atomic transaction.
+    Uses dlt transformers for zero-copy event enrichment.
+    """
+    LOGGER_NAME = "debeziumdlt.DltChangeHandler"
+    
+    def __init__(self, commit_after_load: bool = False):
+        self.log = logging.getLogger(self.LOGGER_NAME)
+        # Block until records are loaded, Debezium marks offsets processed only after we return
+        self.commit_after_load = commit_after_load
+    
+    def handleJsonBatch(self, records: List[ChangeEvent]) -> None:
+        """
+        Process batch of CDC events.
+        Groups events by table and runs ONE pipeline job for efficiency.
+        """
+        if not records:
+            return
+        
+        # Extract values immediately (ChangeEvent may be tied to JNI resources)
+        safe_records = []
+        for r in records:
+            try:
+                # Extract key/value strings
+                safe_records.append({
+                    "key": r.key(),
+                    "value": r.value(),
+                    "destination": r.destination()
+                })
+            except Exception as e:
+                self.log.error(f"Error extracting record data: {e}")
+
+        if safe_records:
+            self.log.debug(f"Queuing {len(safe_records)} records")
+            ack = LoadAck() if self.commit_after_load else None
+            metrics.record_received(len(safe_records))
+            event_queue.put((safe_records, ack))
+
+            if ack:
+                ack.loaded.wait()
+                if ack.error:
+                    # Stops the engine without marking the batch processed, it is replayed on restart
+                    raise RuntimeError(f"Load failed, offsets not committed: {ack.error}")
+
+
+# Debezium (Kafka Connect) types which map 1:1 to dlt data types.
+# Logical types (e.g. io.debezium.time.Date on int32) are decoded, see LOGICAL_TYPES.
+DEBEZIUM_TYPE_MAP = {
+    "boolean": "bool",
+    "int8": "bigint",
+    "int16": "bigint",
+    "int32": "bigint",
+    "int64": "bigint",
+    "float32": "double",
+    "float64": "double",
+    "string": "text",
+}
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_DATE = date(1970, 1, 1)
+
+
+def decode_decimal(value: str, scale: int) -> Decimal:
+    """Kafka Connect decimal: base64 of the big-endian two's complement unscaled value."""
+    return Decimal(int.from_bytes(base64.b64decode(value), "big", signed=True)).scaleb(-scale)
+
+
+def decimal_column(field: Dict[str, Any]) -> Dict[str, Any]:
+    parameters = field.get("parameters") or {}
+    if "connect.decimal.precision" not in parameters:
+        return {"data_type": "decimal"}
+    return {
+        "data_type": "decimal",
+        "precision": int(parameters["connect.decimal.precision"]),
+        "scale": int(parameters["scale"]),
+    }
+
+
+# Debezium logical types with their default encodings (time.precision.mode=adaptive,
+# decimal.handling.mode=precise) → (decoder of a value and its field schema, dlt column hints).
+# Decoded values have the types the bulk snapshot (`sql_database`, pyarrow backend) loads,
+# so changes land in the same columns instead of int/text variants.
+LOGICAL_TYPES: Dict[
+    str, Tuple[Optional[Callable[[Any, Dict[str, Any]], Any]], Callable[[Dict[str, Any]], Dict[str, Any]]]
+] = {
+    "io.debezium.time.Date": (
+        lambda value, field: EPOCH_DATE + timedelta(days=value),
+        lambda field: {"data_type": "date"},
+    ),
+    "io.debezium.time.Time": (
+        lambda value, field: (EPOCH + timedelta(milliseconds=value)).time(),
+        lambda field: {"data_type": "time"},
+    ),
+    "io.debezium.time.MicroTime": (
+        lambda value, field: (EPOCH + timedelta(microseconds=value)).time(),
+        lambda field: {"data_type": "time"},
+    ),
+    "io.debezium.time.NanoTime": (
+        lambda value, field: (EPOCH + timedelta(microseconds=value // 1000)).time(),
+        lambda field: {"data_type": "time"},
+    ),
+    # Timestamps without time zone, stored as naive UTC like the snapshot does
+    "io.debezium.time.Timestamp": (
+        lambda value, field: EPOCH + timedelta(milliseconds=value),
+        lambda field: {"data_type": "timestamp", "timezone": False},
+    ),
+    "io.debezium.time.MicroTimestamp": (
+        lambda value, field: EPOCH + timedelta(microseconds=value),
+        lambda field: {"data_type": "timestamp", "timezone": False},
+    ),
+    "io.debezium.time.NanoTimestamp": (
+        lambda value, field: EPOCH + timedelta(microseconds=value // 1000),
+        lambda field: {"data_type": "timestamp", "timezone": False},
+    ),
+    "io.debezium.time.ZonedTimestamp": (
+        lambda value, field: ensure_pendulum_datetime(value),
+        lambda field: {"data_type": "timestamp", "timezone": True},
+    ),
+    # Kafka Connect types, used with time.precision.mode=connect
+    "org.apache.kafka.connect.data.Date": (
+        lambda value, field: EPOCH_DATE + timedelta(days=value),
+        lambda field: {"data_type": "date"},
+    ),
+    "org.apache.kafka.connect.data.Time": (
+        lambda value, field: (EPOCH + timedelta(milliseconds=value)).time(),
+        lambda field: {"data_type": "time"},
+    ),
+    "org.apache.kafka.connect.data.Timestamp": (
+        lambda value, field: EPOCH + timedelta(milliseconds=value),
+        lambda field: {"data_type": "timestamp", "timezone": False},
+    ),
+    "org.apache.kafka.connect.data.Decimal": (
+        lambda value, field: decode_decimal(value, int(field["parameters"]["scale"])),
+        decimal_column,
+    ),
+    # NUMERIC without precision: the scale travels with every value
+    "io.debezium.data.VariableScaleDecimal": (
+        lambda value, field: decode_decimal(value["value"], int(value["scale"])),
+        decimal_column,
+    ),
+    # JSON documents stay strings, as in the snapshot, dlt parses them for `json` columns of rows
+    "io.debezium.data.Json": (None, lambda field: {"data_type": "json"}),
+}
+
+if msgspec is not None:
+    class PayloadEnvelope(msgspec.Struct):
+        """Debezium envelope without the schema block (msgspec skips unknown fields unparsed)."""
+        payload: Optional[Dict[str, Any]] = None
+
+
+class EventDecoder:
+    """
+    Decodes Debezium JSON envelopes.
+    Prefers msgspec (skips the schema block), then orjson, then the stdlib json.
+    The schema is parsed once per topic and cached, it is parsed again only
+    when the columns of an event differ from the cached ones (e.g. after ALTER TABLE).
+    """
+
+    def __init__(self, library: Optional[str] = None):
+        if library is None:
+            library = "msgspec" if msgspec is not None else "orjson" if orjson is not None else "json"
+        self.library = library
+        self.loads = {
+            "msgspec": lambda value: msgspec.json.decode(value),
+            "orjson": lambda value: orjson.loads(value),
+            "json": json.loads,
+        }[library]
+        self.payload_decoder = msgspec.json.Decoder(PayloadEnvelope) if library == "msgspec" else None
+        # topic -> {column: Debezium field schema}
+        self.schemas: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # topic -> [(column, decoder, field schema)] of columns with logical types
+        self.logical_columns: Dict[str, List[Tuple[str, Callable[[Any, Dict[str, Any]], Any], Dict[str, Any]]]] = {}
+
+    def decode(self, topic: str, value: Any) -> Optional[Dict[str, Any]]:
+        """Return the payload of a change event, caching the topic schema on the way."""
+        if self.payload_decoder is not None:
+            payload = self.payload_decoder.decode(value).payload
+            if payload and self.schema_changed(topic, payload):
+                self.cache_schema(topic, self.loads(value).get("schema"), payload)
+            return payload
+
+        envelope = self.loads(value)
+        payload = envelope.get("payload")
+        if payload and self.schema_changed(topic, payload):
+            self.cache_schema(topic, envelope.get("schema"), payload)
+        return payload
+
+    def schema_changed(self, topic: str, payload: Dict[str, Any]) -> bool:
+        row = payload.get("after") or payload.get("before")
+        cached = self.schemas.get(topic)
+        return cached is None or (row is not None and row.keys() != cached.keys())
+
+    def cache_schema(self, topic: str, schema: Optional[Dict[str, Any]], payload: Dict[str, Any]) -> None:
+        """Keep the row fields of the envelope schema (or just column names if schemas are disabled)."""
+        columns: Dict[str, Dict[str, Any]] = {}
+        for field in (schema or {}).get("fields", []):
+            if field.get("field") in ("after", "before") and field.get("fields"):
+                columns = {column["field"]: column for column in field["fields"]}
+                break
+
+        if not columns:
+            row = payload.get("after") or payload.get("before") or {}
+            columns = {column: {} for column in row}
+
+        self.schemas[topic] = columns
+        self.logical_columns[topic] = [
+            (column, LOGICAL_TYPES[field["name"]][0], field)
+            for column, field in columns.items()
+            if LOGICAL_TYPES.get(field.get("name"), (None,))[0] is not None
+        ]
+
+    def decode_logical(self, topic: str, row: Dict[str, Any]) -> None:
+        """Decode values of logical types (dates, timestamps, decimals...) in place."""
+        for column, decode, field in self.logical_columns.get(topic, ()):
+            value = row.get(column)
+            if value is not None:
+                row[column] = decode(value, field)
+
+    def dlt_columns(self, topic: str) -> Dict[str, Dict[str, Any]]:
+        """Column hints for dlt derived from the cached schema of the topic."""
+        hints = {}
+        for column, field in self.schemas.get(topic, {}).items():
+            if field.get("name"):
+                if field["name"] in LOGICAL_TYPES:
+                    hints[column] = {"name": column, **LOGICAL_TYPES[field["name"]][1](field)}
+                continue
+            data_type = DEBEZIUM_TYPE_MAP.get(field.get("type"))
+            if data_type:
+                hints[column] = {"name": column, "data_type": data_type}
+        return hints
+
+
+# Decoder used by the parse stage (single thread)
+event_decoder = EventDecoder()
+
+
+def event_position(source: Dict[str, Any], position_fields: Tuple[Tuple[str, Any], ...]) -> Tuple:
+    """
+    Position of the change in the source log, comparable within a connector
+    (e.g. LSN for PostgreSQL, binlog file, offset and row for MySQL).
+    Missing fields get the profile's default of the same type.
+    """
+    positions = []
+    for field, default in position_fields:
+        value = source.get(field)
+        positions.append(default if value is None else value)
+    return tuple(positions)
+
+
+def parse_event(
+    record_dict: Dict[str, Any],
+    decoder: Optional[EventDecoder] = None,
+    position_fields: Tuple[Tuple[str, Any], ...] = (),
+) -> Optional[Dict[str, Any]]:
+    """
+    Parses Debezium JSON.
+    The preceding 'delete' event (op='d') already contained the data we needed.
+    """
+    # 1. Ignore Tombstones (Value is None)
+    if record_dict["value"] is None:
+        return None
+    
+    decoder = decoder or event_decoder
+    # 2. Parse Standard Event, decode errors are raised to the caller
+    payload = decoder.decode(record_dict["destination"], record_dict["value"]) or {}
+
+    op = payload.get("op")
+    # 'd' uses 'before' (state before delete), others use 'after'
+    data = payload.get("before" if op == "d" else "after")
+
+    if not data:
+        return None
+    decoder.decode_logical(record_dict["destination"], data)
+
+    source = payload.get("source", {})
+
+    return {
+        "op": op,
+        "table": source.get("table"),
+        "topic": record_dict["destination"],
+        "position": event_position(source, position_fields),
+        # Commit time in the source database
+        "ts_ms": source.get("ts_ms"),
+        "payload": data,
+    }
+
+
+# Debezium (Kafka Connect) types → pyarrow type factories for Arrow batches
+ARROW_TYPES = {
+    "boolean": ("bool_",),
+    "int8": ("int8",),
+    "int16": ("int16",),
+    "int32": ("int32",),
+    "int64": ("int64",),
+    "float32": ("float32",),
+    "float64": ("float64",),
+    "string": ("string",),
+}
+# Logical types are decoded by `parse_event` already, these are types of the decoded values
+ARROW_LOGICAL_TYPES = {
+    "io.debezium.time.Date": ("date32",),
+    "io.debezium.time.Time": ("time32", "ms"),
+    "io.debezium.time.MicroTime": ("time64", "us"),
+    "io.debezium.time.NanoTime": ("time64", "us"),
+    "io.debezium.time.Timestamp": ("timestamp", "ms"),
+    "io.debezium.time.MicroTimestamp": ("timestamp", "us"),
+    "io.debezium.time.NanoTimestamp": ("timestamp", "us"),
+    "io.debezium.time.ZonedTimestamp": ("timestamp", "us", "UTC"),
+    "org.apache.kafka.connect.data.Date": ("date32",),
+    "org.apache.kafka.connect.data.Time": ("time32", "ms"),
+    "org.apache.kafka.connect.data.Timestamp": ("timestamp", "ms"),
+}
+
+
+def arrow_type(pa: Any, field: Dict[str, Any]) -> Any:
+    """Arrow type of a Debezium field, None for types left to pyarrow inference."""
+    if field.get("name") == "org.apache.kafka.connect.data.Decimal":
+        column = decimal_column(field)
+        if column.get("precision", 39) > 38:
+            return None
+        return pa.decimal128(column["precision"], column["scale"])
+    if field.get("name"):
+        factory = ARROW_LOGICAL_TYPES.get(field["name"])
+    else:
+        factory = ARROW_TYPES.get(field.get("type"))
+    if not factory:
+        return None
+    return getattr(pa, factory[0])(*factory[1:])
+
+
+def events_to_arrow(
+    table_name: str, events: List[Dict[str, Any]], fields: Dict[str, Dict[str, Any]], merge: bool
+) -> Any:
+    """
+    Build a columnar `pyarrow.Table` from the events of one table.
+    Column types come from the cached Debezium schema, CDC metadata columns are added vectorially.
+    """
+    from dlt.common.libs.pyarrow import pyarrow as pa
+    import pyarrow.compute as pc
+
+    rows = [event["payload"] for event in events]
+    column_names = list(fields) + [column for column in rows[-1] if column not in fields]
+
+    arrays = []
+    for column in column_names:
+        values = [row.get(column) for row in rows]
+        data_type = arrow_type(pa, fields.get(column, {}))
+        try:
+            arrays.append(pa.array(values, type=data_type))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+            # Values do not fit the declared type, let pyarrow infer it
+            arrays.append(pa.array(values))
+    table = pa.Table.from_arrays(arrays, names=column_names)
+
+    ops = pa.array([event["op"] for event in events], type=pa.string())
+    table = table.append_column("__table", pa.repeat(table_name, len(events)))
+    if merge:
+        table = table.append_column("__deleted", pc.equal(ops, "d"))
+    else:
+        table = table.append_column("__op", pc.if_else(pc.equal(ops, "d"), "delete", ops))
+    return table
+
+
+def create_resource(
+    table_name: str,
+    events: Any,
+    primary_keys: Dict[str, str],
+    columns: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Any:
+    """
+    Create dlt resource with Merge/Append logic.
+    `events` is a list of parsed events or an Arrow table built by `events_to_arrow`.
+    Uses dlt transformer pattern for zero-copy event enrichment.
+    """
+    primary_key = primary_keys.get(table_name)
+    
+    mode = "merge" if primary_key else "append"
+    
+    if not isinstance(events, list):
+        # Arrow table already has CDC columns and types, dlt loads it through its Arrow path
+        resource = dlt.resource(events, name=table_name, write_disposition=mode)
+        if columns:
+            # Hints Arrow types can't carry (e.g. JSON documents in string columns)
+            resource.apply_hints(columns=columns)
+        if mode == "merge":
+            resource.apply_hints(primary_key=primary_key)
+        return resource
+    
+    def enrich_event(event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Transform event for dlt loading.
+        Zero-copy: Mutates payload in-place since we own the dict.
+        """
+        row = event["payload"]
+        row["__table"] = table_name
+        
+        if mode == "merge":
+            row["__deleted"] = (event["op"] == "d")
+        else:
+            row["__op"] = "delete" if event["op"] == "d" else event["op"]
+        
+        return row
+    
+    # Create resource from events list
+    resource = dlt.resource(events, name=table_name, write_disposition=mode)
+    resource.add_map(enrich_event)
+    
+    if columns:
+        # Types known from the Debezium schema, dlt does not have to infer them
+        resource.apply_hints(columns=columns)
+    
+    if mode == "merge":
+        resource.apply_hints(primary_key=primary_key)
+    
+    return resource
+
+
+def record_size(record: Dict[str, Any]) -> int:
+    """Approximate size of a raw Debezium record in bytes."""
+    return len(record["key"] or "") + len(record["value"] or "")
+
+
+def collect_batch(
+    window: BatchWindow, stop_event: threading.Event
+) -> Tuple[List[Dict[str, Any]], int, List[LoadAck]]:
+    """
+    Coalesce Debezium batches from the queue into one micro-batch.
+    Waits for the first batch, then keeps draining the queue until the row
+    or byte limit is reached or `max_latency` seconds passed since the first batch.
+    Returns records, the number of queue items taken (each needs `task_done`)
+    and acks of handlers waiting for the load.
+    """
+    try:
+        # Wait for batch with timeout to allow checking stop_event
+        batch, ack = event_queue.get(timeout=1.0)
+    except queue.Empty:
+        return [], 0, []
+
+    records = list(batch)
+    acks = [ack] if ack else []
+    taken = 1
+    size = sum(record_size(r) for r in records)
+    deadline = time.monotonic() + window.max_latency
+
+    # A waiting handler won't send more batches until this one is loaded
+    while not acks and len(records) < window.max_rows and size < window.max_bytes and not stop_event.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch, ack = event_queue.get(timeout=remaining)
+        except queue.Empty:
+            break
+        taken += 1
+        records.extend(batch)
+        size += sum(record_size(r) for r in batch)
+        if ack:
+            acks.append(ack)
+
+    return records, taken, acks
+
+
+class ParsedBatch(NamedTuple):
+    """Output of the parse stage: events grouped by table, in source order."""
+    events_by_table: Dict[str, List[Dict[str, Any]]]
+    columns_by_table: Dict[str, Dict[str, Dict[str, Any]]]
+    records_count: int
+    taken: int
+    acks: List[LoadAck]
+    # Commit time (unix seconds) of the newest change per table
+    source_ts_by_table: Dict[str, float]
+    # Set when the batch could not be parsed, its events are not loaded
+    error: Optional[str] = None
+
+
+def group_events(
+    records: List[Dict[str, Any]],
+    position_fields: Tuple[Tuple[str, Any], ...] = (),
+    fail_on_decode_error: bool = False,
+) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, Dict[str, Dict[str, Any]]]]:
+    """
+    Parse raw records and group them by table, keeping their order. Also returns column hints per table.
+    Records which can't be decoded are counted and skipped, or fail the whole batch with `fail_on_decode_error`.
+    """
+    events_by_table = defaultdict(list)
+    decode_errors = 0
+    for record in records:
+        try:
+            event_data = parse_event(record, position_fields=position_fields)
+        except Exception as e:
+            if fail_on_decode_error:
+                raise
+            decode_errors += 1
+            logger.error(f"Skipping change event of {record.get('destination')} which can't be decoded: {e}")
+            continue
+        if event_data and event_data.get("table"):
+            events_by_table[event_data["table"]].append(event_data)
+    if decode_errors:
+        metrics.record_decode_errors(decode_errors)
+
+    columns_by_table = {
+        table_name: event_decoder.dlt_columns(events[-1]["topic"])
+        for table_name, events in events_by_table.items()
+    }
+    return events_by_table, columns_by_table
+
+
+def compact_events(events: List[Dict[str, Any]], primary_key: Any) -> List[Dict[str, Any]]:
+    """
+    Keep only the last event per primary key.
+    Events are ordered by log position (arrival order breaks ties), so a delete
+    following an update of the same row wins. Survivors are returned in log order.
+    """
+    key_columns = [primary_key] if isinstance(primary_key, str) else list(primary_key)
+
+    latest: Dict[Tuple, Tuple[Tuple, Dict[str, Any]]] = {}
+    for index, event in enumerate(events):
+        row = event["payload"]
+        key = tuple(row.get(column) for column in key_columns)
+        order = (event["position"], index)
+        current = latest.get(key)
+        if current is None or order >= current[0]:
+            latest[key] = (order, event)
+
+    return [event for _, event in sorted(latest.values(), key=lambda item: item[0])]
+
+
+def compact_batch(
+    events_by_table: Dict[str, List[Dict[str, Any]]], primary_keys: Dict[str, str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Compact events of tables which have primary keys configured (merge tables)."""
+    for table_name, events in events_by_table.items():
+        primary_key = primary_keys.get(table_name)
+        if primary_key and len(events) > 1:
+            compacted = compact_events(events, primary_key)
+            if len(compacted) < len(events):
+                logger.debug(f"Compacted {table_name}: {len(events)} → {len(compacted)} events")
+            events_by_table[table_name] = compacted
+    return events_by_table
+
+
+def put_stage(stage_queue: queue.Queue, item: Any, stop_event: threading.Event) -> bool:
+    """Put into a bounded stage queue, giving up when the loader stops."""
+    while not stop_event.is_set():
+        try:
+            stage_queue.put(item, timeout=1.0)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def parse_stage(
+    window: BatchWindow,
+    parsed_queue: queue.Queue,
+    stop_event: threading.Event,
+    primary_keys: Dict[str, str],
+    compact: bool = True,
+    arrow_batches: bool = False,
+    position_fields: Tuple[Tuple[str, Any], ...] = (),
+    fail_on_decode_error: bool = False,
+):
+    """
+    Stage 1: coalesce, parse, group and compact events (and convert them to Arrow tables).
+    Runs in its own thread so JSON parsing of the next batch overlaps with the load of the previous one.
+    A batch which fails to parse is handed over with its `error`, so its handlers don't commit offsets.
+    """
+    while not stop_event.is_set():
+        # Many small Debezium batches are coalesced into a single load
+        records, taken, acks = collect_batch(window, stop_event)
+        if not taken:
+            continue
+
+        metrics.record_batch(len(records))
+        started_at = time.monotonic()
+        error = None
+        try:
+            events_by_table, columns_by_table = group_events(records, position_fields, fail_on_decode_error)
+            source_ts_by_table = {
+                table_name: max(event["ts_ms"] or 0 for event in events) / 1000
+                for table_name, events in events_by_table.items()
+            }
+            if compact and primary_keys:
+                events_by_table = compact_batch(events_by_table, primary_keys)
+            if arrow_batches:
+                events_by_table = {
+                    table_name: events_to_arrow(
+                        table_name,
+                        events,
+                        event_decoder.schemas.get(events[-1]["topic"], {}),
+                        bool(primary_keys.get(table_name)),
+                    )
+                    for table_name, events in events_by_table.items()
+                }
+        except Exception as e:
+            logger.error(f"❌ Batch parse failed: {e}", exc_info=True)
+            events_by_table, columns_by_table, source_ts_by_table = {}, {}, {}
+            error = f"batch parse failed: {e}"
+        metrics.record_parse(time.monotonic() - started_at, error is None)
+
+        batch = ParsedBatch(events_by_table, columns_by_table, len(records), taken, acks, source_ts_by_table, error)
+        put_stage(parsed_queue, batch, stop_event)
+
+
+def load_batch(
+    pipeline: dlt.Pipeline,
+    batch: ParsedBatch,
+    primary_keys: Dict[str, str],
+    load_lock: Optional[threading.Lock] = None,
+) -> bool:
+    """Stage 2: extract, normalize and load one parsed batch. Returns False if the parse or load failed."""
+    if batch.error:
+        return False
+    if not batch.events_by_table:
+        return True
+
+    started_at = time.monotonic()
+    loaded = load_resources(pipeline, batch, primary_keys, load_lock)
+    metrics.record_load(
+        time.monotonic() - started_at,
+        {table_name: len(events) for table_name, events in batch.events_by_table.items()},
+        batch.source_ts_by_table,
+        loaded,
+    )
+    return loaded
+
+
+def load_resources(
+    pipeline: dlt.Pipeline,
+    batch: ParsedBatch,
+    primary_keys: Dict[str, str],
+    load_lock: Optional[threading.Lock] = None,
+) -> bool:
+    """
+    Create resources of a parsed batch and run the pipeline. Returns False if the load failed.
+    With `load_lock` only the steps writing to the destination hold it, extract and normalize don't.
+    """
+    try:
+        logger.info(
+            f"Processing batch: {batch.records_count} events from {batch.taken} Debezium batches, "
+            f"{sum(len(events) for events in batch.events_by_table.values())} rows "
+            f"across {len(batch.events_by_table)} tables"
+        )
+
+        # 1. Create Resources
+        resources = []
+        for table_name, events in batch.events_by_table.items():
+            columns = batch.columns_by_table.get(table_name)
+            resources.append(create_resource(table_name, events, primary_keys, columns))
+        
+        # 2. Execute load (runs in main thread)
+        if load_lock is None:
+            load_info = pipeline.run(resources)
+        else:
+            pipeline.extract(resources)
+            pipeline.normalize()
+            with load_lock:
+                load_info = pipeline.load()
+        logger.info(f"✅ Batch load complete: {load_info}")
+        
+        # Sync to ensure data is written and locks are released
+        try:
+            with load_lock or nullcontext():
+                pipeline.sync_destination()
+        except Exception as sync_err:
+            logger.debug(f"Sync destination note: {sync_err}")
+        return True
+            
+    except Exception as e:
+        logger.error(f"❌ Batch load failed: {e}", exc_info=True)
+        try:
+            with load_lock or nullcontext():
+                pipeline.sync_destination()
+        except:
+            pass
+        return False
+
+
+class BatchCompletion:
+    """
+    Marks queue items of a batch as done once every part of it was loaded
+    and releases the handlers waiting for it.
+    """
+
+    def __init__(self, batch: ParsedBatch, parts: int = 1):
+        self.taken = batch.taken
+        self.acks = batch.acks
+        self.parts = parts
+        self.error = batch.error
+        self.failed = batch.error is not None
+        self.lock = threading.Lock()
+
+    def part_done(self, loaded: bool = True) -> None:
+        with self.lock:
+            self.failed = self.failed or not loaded
+            self.parts -= 1
+            if self.parts > 0:
+                return
+        for ack in self.acks:
+            ack.done((self.error or "dlt load failed, see the loader log") if self.failed else None)
+        for _ in range(self.taken):
+            event_queue.task_done()
+
+
+def worker_index(table_name: str, workers: int) -> int:
+    """Stable table → worker assignment, so changes of a table are always loaded in order by one worker."""
+    return zlib.crc32(table_name.encode("utf-8")) % workers
+
+
+def split_batch(batch: ParsedBatch, workers: int) -> Dict[int, ParsedBatch]:
+    """Split a parsed batch into per worker parts."""
+    tables_by_worker = defaultdict(list)
+    for table_name in batch.events_by_table:
+        tables_by_worker[worker_index(table_name, workers)].append(table_name)
+
+    parts = {}
+    for index, table_names in tables_by_worker.items():
+        events_by_table = {name: batch.events_by_table[name] for name in table_names}
+        parts[index] = ParsedBatch(
+            events_by_table,
+            {name: batch.columns_by_table[name] for name in table_names if name in batch.columns_by_table},
+            sum(len(events) for events in events_by_table.values()),
+            batch.taken,
+            batch.acks,
+            {name: batch.source_ts_by_table[name] for name in table_names if name in batch.source_ts_by_table},
+            batch.error,
+        )
+    return parts
+
+
+def create_worker_pipelines(pipeline: dlt.Pipeline, workers: int) -> List[dlt.Pipeline]:
+    """
+    Pipelines for parallel load workers. Each has its own working dir, state and schema,
+    and loads into the same destination and dataset as `pipeline`, with its resolved credentials
+    (e.g. DuckDB's default database file is named after `pipeline`, not after the worker).
+    """
+    credentials = pipeline.destination_client().config.credentials
+    destination = Destination.from_reference(
+        pipeline.destination.destination_type,
+        credentials=credentials,
+        destination_name=pipeline.destination.destination_name,
+    )
+    return [
+        dlt.pipeline(
+            pipeline_name=f"{pipeline.pipeline_name}_worker_{index}",
+            destination=destination,
+            dataset_name=pipeline.dataset_name,
+        )
+        for index in range(workers)
+    ]
+
+
+def destination_lock(pipeline: dlt.Pipeline) -> Optional[threading.Lock]:
+    """
+    Lock serializing writes of worker pipelines loading into the same DuckDB file. DuckDB runs
+    concurrent transactions optimistically and fails those changing the same rows or catalog
+    entries, as schema migrations and dlt's state updates of the shared dataset may. None for
+    other destinations.
+    """
+    if not pipeline.destination.destination_type.endswith(".duckdb"):
+        return None
+    database = os.path.abspath(str(pipeline.destination_client().config.credentials.database))
+    with worker_init_lock:
+        return destination_locks.setdefault(database, threading.Lock())
+
+
+def load_worker(
+    pipeline: dlt.Pipeline,
+    worker_queue: queue.Queue,
+    primary_keys: Dict[str, str],
+    stop_event: threading.Event,
+    load_lock: Optional[threading.Lock] = None,
+):
+    """
+    Load stage of one worker: loads its tables' parts of the batches in arrival order.
+    Workers extract and normalize in parallel, writes to a DuckDB file take `load_lock` one at a time.
+    """
+    initialized = False
+    while not stop_event.is_set():
+        try:
+            part, completion = worker_queue.get(timeout=1.0)
+        except queue.Empty:
+            continue
+
+        loaded = False
+        try:
+            if initialized:
+                loaded = load_batch(pipeline, part, primary_keys, load_lock)
+            else:
+                # Workers creating the shared dataset at the same time would conflict
+                with worker_init_lock:
+                    loaded = initialized = load_batch(pipeline, part, primary_keys, load_lock)
+        finally:
+            completion.part_done(loaded)
+
+
+def process_queue(
+    pipeline: dlt.Pipeline,
+    primary_keys: Dict[str, str],
+    stop_event: threading.Event,
+    window: Optional[BatchWindow] = None,
+    pipeline_depth: Optional[int] = None,
+    load_workers: Optional[int] = None,
+    position_fields: Tuple[Tuple[str, Any], ...] = (),
+):
+    """
+    Main loop that consumes events from the queue and runs the pipeline.
+    Parsing runs in a background thread and hands batches over through a bounded queue,
+    batches are loaded one by one in arrival order, so per table ordering is kept.
+    With `load_workers` > 1 tables are partitioned across worker pipelines loading in parallel.
+    """
+    window = window or load_batch_window()
+    pipeline_depth = pipeline_depth or int(get_cdc_setting("pipeline_depth", DEFAULT_PIPELINE_DEPTH))
+    load_workers = load_workers or int(get_cdc_setting("load_workers", 1))
+    # Collapse repeated changes of a row to its last state before loading
+    compact = bool(get_cdc_setting("compact_events", True))
+    # Build columnar Arrow tables instead of row dicts
+    arrow_batches = bool(get_cdc_setting("arrow_batches", False))
+    # Fail the batch (instead of skipping the event) when a change event can't be decoded
+    fail_on_decode_error = bool(get_cdc_setting("fail_on_decode_error", False))
+    logger.info(
+        f"Queue consumer started. Waiting for events... (batch window: {window.max_rows} rows, "
+        f"{window.max_bytes} bytes, {window.max_latency}s, pipeline depth: {pipeline_depth}, "
+        f"compaction: {'on' if compact else 'off'}, arrow: {'on' if arrow_batches else 'off'}, "
+        f"load workers: {load_workers})"
+    )
+
+    # Bounded, so parsing can't run far ahead of a slow destination
+    parsed_queue: queue.Queue = queue.Queue(maxsize=pipeline_depth)
+    parser_thread = threading.Thread(
+        target=parse_stage,
+        args=(
+            window, parsed_queue, stop_event, primary_keys, compact, arrow_batches, position_fields, fail_on_decode_error
+        ),
+        name="CdcParseThread",
+    )
+    parser_thread.daemon = True
+    parser_thread.start()
+
+    worker_queues: List[queue.Queue] = []
+    if load_workers > 1:
+        load_lock = destination_lock(pipeline)
+        for index, worker_pipeline in enumerate(create_worker_pipelines(pipeline, load_workers)):
+            worker_queue: queue.Queue = queue.Queue(maxsize=pipeline_depth)
+            worker_thread = threading.Thread(
+                target=load_worker,
+                args=(worker_pipeline, worker_queue, primary_keys, stop_event, load_lock),
+                name=f"CdcLoadWorker-{index}",
+            )
+            worker_thread.daemon = True
+            worker_thread.start()
+            worker_queues.append(worker_queue)
+            logger.info(f"✅ Load worker {index} active: {worker_pipeline.pipeline_name}")
+    
+    while not stop_event.is_set():
+        try:
+            batch = parsed_queue.get(timeout=1.0)
+        except queue.Empty:
+            continue
+
+        if not worker_queues:
+            loaded = False
+            try:
+                loaded = load_batch(pipeline, batch, primary_keys)
+            finally:
+                BatchCompletion(batch).part_done(loaded)
+            continue
+
+        # Fan out, a slow table blocks only its own worker (until its queue is full)
+        parts = split_batch(batch, len(worker_queues))
+        completion = BatchCompletion(batch, max(len(parts), 1))
+        if not parts:
+            completion.part_done(not batch.error)
+        for index, part in parts.items():
+            put_stage(worker_queues[index], (part, completion), stop_event)
+
+
+def load_properties(filepath: Path) -> Properties:
+    """Load Java .properties file into a dictionary-like object."""
+    props = Properties()
+    if not filepath.exists():
+        return props
+    
+    with open(filepath, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                key, value = line.split('=', 1)
+                props.setProperty(key.strip(), value.strip())
+    return props
+
+
+def add_dlt_columns_to_arrow() -> None:
+    """
+    Add `_dlt_load_id` and `_dlt_id` to Arrow items (bulk snapshot, Arrow batches) as dlt does to rows,
+    so both can load into the same table: DuckDB can't add the NOT NULL `_dlt_id` of a MERGE later.
+    """
+    dlt.config["normalize.parquet_normalizer.add_dlt_id"] = True
+    dlt.config["normalize.parquet_normalizer.add_dlt_load_id"] = True
+
+
+def run_cdc(profile: ConnectorProfile) -> None:
+    """Run the CDC pipeline for the connector described by `profile`."""
+    setup_logging()
+    logger.info(f"Starting {profile.title} CDC Pipeline: Debezium + dlt")
+    
+    # Primary keys for merge operations (configurable via .dlt/config.toml)
+    primary_keys = dlt.config.get("cdc_settings.primary_keys", {})
+    window = load_batch_window()
+    # Offsets are committed only for loaded events (exactly-once-ish with MERGE tables)
+    commit_after_load = bool(get_cdc_setting("commit_after_load", False))
+    add_dlt_columns_to_arrow()
+    
+    # Init pipeline (dlt auto-reads credentials from .dlt/secrets.toml)
+    pipeline = dlt.pipeline(
+        pipeline_name=profile.pipeline_name,
+        destination="duckdb",
+        dataset_name=profile.dataset_name,
+    )
+    logger.info(f"✅ Pipeline Active: {profile.pipeline_name} → {profile.dataset_name}")
+    
+    # Copy existing rows directly instead of streaming them through Debezium
+    snapshot_mode = None
+    if get_cdc_setting("bulk_snapshot", False):
+        if bulk_snapshot_needed(profile.name):
+            run_bulk_snapshot(pipeline, profile.name, profile.db_config_section, primary_keys)
+        snapshot_mode = STREAMING_SNAPSHOT_MODE
+    
+    # Setup Debezium Config
+    props_file = generate_debezium_properties_file(
+        connector_class=profile.connector_class,
+        db_config_section=profile.db_config_section,
+        snapshot_mode=snapshot_mode,
+    )
+    
+    if primary_keys:
+        logger.info(f"Keys Configured: {list(primary_keys.keys())}")
+    else:
+        logger.info("Using APPEND mode (no primary keys configured)")
+
+    metrics_port = get_cdc_setting("metrics_port", None)
+    if metrics_port:
+        start_metrics_server(metrics, int(metrics_port), get_cdc_setting("metrics_host", "127.0.0.1"))
+
+    # Start Debezium in background thread (it blocks, so dlt runs in main thread)
+    stop_event = threading.Event()
+    
+    # Init Debezium
+    props = load_properties(props_file)
+    handler = DltChangeHandler(commit_after_load=commit_after_load)
+    engine = DebeziumJsonEngine(props, handler)
+    
+    def run_engine():
+        try:
+            engine.run()
+        except Exception as e:
+            logger.error(f"Engine crashed: {e}")
+        finally:
+            if commit_after_load:
+                # Nothing is left to load, exit so the process is restarted from committed offsets
+                stop_event.set()
+    
+    engine_thread = threading.Thread(target=run_engine, name="DebeziumEngineThread")
+    engine_thread.daemon = True
+    engine_thread.start()
+    
+    # Register signal handlers
+    def signal_handler(sig, frame):
+        logger.info(f"\nSignal {sig} received. Stopping...")
+        stop_event.set()
+        try:
+            engine.interrupt() 
+        except:
+            pass
+        sys.exit(0)
+    
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+    
+    # Run queue processor in main thread (dlt runs here for thread safety)
+    try:
+        process_queue(pipeline, primary_keys, stop_event, window, position_fields=profile.position_fields)
+        if commit_after_load:
+            logger.error("❌ Debezium engine stopped, exiting")
+            sys.exit(1)
+    except KeyboardInterrupt:
+        logger.info("Interrupted by user")
+    finally:
+        logger.info("Pipeline shutdown complete")
+
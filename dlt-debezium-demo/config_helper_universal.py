@@ -2,27 +2,39 @@
 Configuration helper for Universal Debezium + dlt integration.
 
 Supports multiple database connectors by configuring Debezium properties
-from dlt secrets.toml configuration.
+from dlt secrets.toml configuration. Connector-specific properties come from
+the connector profiles in `connector_profiles.py`.
 """
 import logging
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import dlt
 
+from connector_profiles import profile_for_connector_class
+
 logger = logging.getLogger(__name__)
 
+BASE_PATH = Path(__file__).resolve().parent
+
+
+def offsets_file_path(connector_type: str) -> Path:
+    """Debezium offsets file of the connector ("postgres" or "mysql")."""
+    return BASE_PATH / "tmp" / f"offsets_{connector_type}_debezium.dat"
+
 
 def generate_debezium_properties_file(
     connector_class: str = "io.debezium.connector.postgresql.PostgresConnector",
     db_config_section: str = "sources.debezium.postgres",
+    snapshot_mode: Optional[str] = None,
 ) -> Path:
     """
     Generates Debezium properties file from dlt secrets.
     
     Uses a dictionary-based approach for maintainability and extensibility.
+    `snapshot_mode` overrides the `snapshot_mode` from secrets (used after a bulk snapshot).
     """
-    base_path = Path(__file__).resolve().parent
+    base_path = BASE_PATH
     (base_path / ".dlt").mkdir(exist_ok=True)
     (base_path / "tmp").mkdir(exist_ok=True)
 
@@ -36,51 +48,34 @@ def generate_debezium_properties_file(
     extra_conf = dlt.secrets.get("sources.debezium", {})
 
     # 2. Define Common Properties (Universal)
-    connector_type = "mysql" if "mysql" in connector_class.lower() else "postgres"
-    offset_file = base_path / "tmp" / f"offsets_{connector_type}_debezium.dat"
+    profile = profile_for_connector_class(connector_class)
+    connector_type = profile.name
+    offset_file = offsets_file_path(connector_type)
     
     props: Dict[str, Any] = {
         "name": f"debezium_{db_conf.get('database', 'source')}_connector",
         "connector.class": connector_class,
         "database.hostname": db_conf.get('host', 'localhost'),
-        "database.port": db_conf.get('port', 3306 if connector_type == 'mysql' else 5432),
+        "database.port": db_conf.get('port', profile.default_port),
         "database.user": db_conf.get('username', db_conf.get('user', '')),
         "database.password": db_conf.get('password', ''),
         "database.server.name": extra_conf.get('server_name', db_conf.get('database', 'source')),
         "topic.prefix": extra_conf.get('topic_prefix', db_conf.get('database', 'source')),
         "table.include.list": extra_conf.get('table_include_list', '.*'),
-        "snapshot.mode": extra_conf.get('snapshot_mode', 'initial'),
+        "snapshot.mode": snapshot_mode or extra_conf.get('snapshot_mode', 'initial'),
         
         # Offset Storage (Universal)
         "offset.storage": "org.apache.kafka.connect.storage.FileOffsetBackingStore",
         "offset.storage.file.filename": str(offset_file.absolute()),
         "offset.flush.interval.ms": extra_conf.get('offset_flush_interval_ms', 60000),
+
+        # Batching (records handed to the Python handler at once)
+        "max.batch.size": extra_conf.get('max_batch_size', 2048),
+        "max.queue.size": extra_conf.get('max_queue_size', 8192),
     }
 
     # 3. Apply Connector-Specific Logic
-    if connector_type == "postgres":
-        props.update({
-            "database.dbname": db_conf.get('database', db_conf.get('dbname', '')),
-            "plugin.name": "pgoutput",
-            "slot.name": extra_conf.get('slot_name', 'debezium_slot'),
-            "publication.name": extra_conf.get('publication_name', 'debezium_pub'),
-            # Critical: prevent tombstone-only events so we get the 'before' data for deletes
-            "tombstones.on.delete": extra_conf.get('tombstones_on_delete', 'false'),
-        })
-        
-    elif connector_type == "mysql":
-        server_name = extra_conf.get('server_name') or extra_conf.get('topic_prefix') or db_conf.get('database', 'source')
-        props.update({
-            "database.server.name": server_name,
-            "topic.prefix": server_name,
-            "database.server.id": extra_conf.get('server_id', 184054),
-            "database.include.list": extra_conf.get('database_include_list', db_conf.get('database', '')),
-            # MySQL requires both 'file' and 'file.filename' for offset storage
-            "offset.storage.file": str(offset_file.absolute()),
-            # Schema history (file-based, not Kafka - required for embedded Debezium)
-            "schema.history.internal": "io.debezium.storage.file.history.FileSchemaHistory",
-            "schema.history.internal.file.filename": str((base_path / 'tmp' / 'schema_history_mysql.dat').absolute()),
-        })
+    props.update(profile.debezium_properties(db_conf, extra_conf, offset_file))
 
     # 4. Write to File
     props_file = base_path / ".dlt" / "debezium.properties"
@@ -0,0 +1,90 @@
+"""
+Connector profiles for the CDC runtime.
+
+A profile bundles everything that differs between Debezium connectors:
+connector class, config sections, connector-specific Debezium properties,
+default pipeline names and the fields ordering change events in the source log.
+Add a profile here to support another database.
+"""
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Tuple
+
+
+class ConnectorProfile(NamedTuple):
+    """Connector-specific settings of the CDC runtime."""
+    name: str  # short name used in file names, e.g. offsets_<name>_debezium.dat
+    title: str
+    connector_class: str
+    db_config_section: str
+    default_port: int
+    pipeline_name: str
+    dataset_name: str
+    # `source` fields giving the position of a change in the log, compared as a tuple,
+    # with the value used when a field is missing (of the field's type, so tuples stay comparable)
+    position_fields: Tuple[Tuple[str, Any], ...]
+    # (db_conf, extra_conf, offset_file) -> Debezium properties specific to the connector
+    debezium_properties: Callable[[Dict[str, Any], Dict[str, Any], Path], Dict[str, Any]]
+
+
+def postgres_properties(db_conf: Dict[str, Any], extra_conf: Dict[str, Any], offset_file: Path) -> Dict[str, Any]:
+    return {
+        "database.dbname": db_conf.get('database', db_conf.get('dbname', '')),
+        "plugin.name": "pgoutput",
+        "slot.name": extra_conf.get('slot_name', 'debezium_slot'),
+        "publication.name": extra_conf.get('publication_name', 'debezium_pub'),
+        # Critical: prevent tombstone-only events so we get the 'before' data for deletes
+        "tombstones.on.delete": extra_conf.get('tombstones_on_delete', 'false'),
+    }
+
+
+def mysql_properties(db_conf: Dict[str, Any], extra_conf: Dict[str, Any], offset_file: Path) -> Dict[str, Any]:
+    server_name = extra_conf.get('server_name') or extra_conf.get('topic_prefix') or db_conf.get('database', 'source')
+    return {
+        "database.server.name": server_name,
+        "topic.prefix": server_name,
+        "database.server.id": extra_conf.get('server_id', 184054),
+        "database.include.list": extra_conf.get('database_include_list', db_conf.get('database', '')),
+        # MySQL requires both 'file' and 'file.filename' for offset storage
+        "offset.storage.file": str(offset_file.absolute()),
+        # Schema history (file-based, not Kafka - required for embedded Debezium)
+        "schema.history.internal": "io.debezium.storage.file.history.FileSchemaHistory",
+        "schema.history.internal.file.filename": str((offset_file.parent / 'schema_history_mysql.dat').absolute()),
+    }
+
+
+POSTGRES = ConnectorProfile(
+    name="postgres",
+    title="PostgreSQL",
+    connector_class="io.debezium.connector.postgresql.PostgresConnector",
+    db_config_section="sources.debezium.postgres",
+    default_port=5432,
+    pipeline_name="debezium_dlt_pipeline",
+    dataset_name="debezium_data",
+    position_fields=(("lsn", 0),),
+    debezium_properties=postgres_properties,
+)
+
+MYSQL = ConnectorProfile(
+    name="mysql",
+    title="MySQL",
+    connector_class="io.debezium.connector.mysql.MySqlConnector",
+    db_config_section="sources.debezium.mysql",
+    default_port=3306,
+    pipeline_name="mysql_cdc",
+    dataset_name="mysql_cdc_data",
+    # binlog file name, offset in the file and row within the event
+    position_fields=(("file", ""), ("pos", 0), ("row", 0)),
+    debezium_properties=mysql_properties,
+)
+
+PROFILES = {profile.name: profile for profile in (POSTGRES, MYSQL)}
+
+
+def profile_for_connector_class(connector_class: str) -> ConnectorProfile:
+    """Find the profile of a Debezium connector class."""
+    for profile in PROFILES.values():
+        if profile.connector_class == connector_class:
+            return profile
+    raise ValueError(
+        f"No connector profile for {connector_class}, known: {[p.connector_class for p in PROFILES.values()]}"
+    )
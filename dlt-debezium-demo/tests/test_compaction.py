@@ -0,0 +1,78 @@
+"""
+Compaction of change events per primary key.
+
+    python -m pytest tests
+"""
+from typing import Any, Dict, List
+
+import pytest
+
+pytest.importorskip("pydbzengine")
+
+from cdc_runtime import compact_batch, compact_events
+
+
+def event(op: str, position: Any, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Parsed event as `parse_event` returns it."""
+    return {"op": op, "table": "users", "topic": "db.public.users", "position": position, "ts_ms": 0, "payload": row}
+
+
+def ops(events: List[Dict[str, Any]]) -> List[Any]:
+    return [(item["op"], item["payload"]["id"], item["payload"].get("name")) for item in events]
+
+
+def test_keeps_last_change_per_key_in_log_order() -> None:
+    events = [
+        event("c", (1,), {"id": 1, "name": "a"}),
+        event("c", (2,), {"id": 2, "name": "b"}),
+        event("u", (3,), {"id": 1, "name": "a2"}),
+        event("c", (4,), {"id": 3, "name": "c"}),
+        event("u", (5,), {"id": 2, "name": "b2"}),
+    ]
+    assert ops(compact_events(events, "id")) == [("u", 1, "a2"), ("c", 3, "c"), ("u", 2, "b2")]
+
+
+def test_delete_after_update_wins() -> None:
+    events = [
+        event("u", (1,), {"id": 1, "name": "a2"}),
+        event("d", (2,), {"id": 1, "name": "a2"}),
+        event("c", (3,), {"id": 2, "name": "b"}),
+    ]
+    assert ops(compact_events(events, "id")) == [("d", 1, "a2"), ("c", 2, "b")]
+
+
+def test_log_position_wins_over_arrival_order() -> None:
+    # the update arrives first but happened later in the source log
+    events = [
+        event("u", (20,), {"id": 1, "name": "later"}),
+        event("u", (10,), {"id": 1, "name": "earlier"}),
+    ]
+    assert ops(compact_events(events, "id")) == [("u", 1, "later")]
+
+
+def test_arrival_order_breaks_position_ties() -> None:
+    # e.g. MySQL rows of one binlog event without a row position
+    events = [
+        event("u", ("mysql-bin.000001", 400, 0), {"id": 1, "name": "first"}),
+        event("u", ("mysql-bin.000001", 400, 0), {"id": 1, "name": "second"}),
+    ]
+    assert ops(compact_events(events, "id")) == [("u", 1, "second")]
+
+
+def test_composite_primary_key() -> None:
+    events = [
+        event("c", (1,), {"id": 1, "tenant": "x", "name": "a"}),
+        event("c", (2,), {"id": 1, "tenant": "y", "name": "b"}),
+        event("u", (3,), {"id": 1, "tenant": "x", "name": "a2"}),
+    ]
+    assert ops(compact_events(events, ["id", "tenant"])) == [("c", 1, "b"), ("u", 1, "a2")]
+
+
+def test_compacts_only_merge_tables() -> None:
+    changes = [event("u", (idx,), {"id": 1, "name": str(idx)}) for idx in range(3)]
+    events_by_table = {"users": list(changes), "audit_log": list(changes)}
+
+    compacted = compact_batch(events_by_table, {"users": "id"})
+    assert ops(compacted["users"]) == [("u", 1, "2")]
+    # APPEND tables keep every change
+    assert len(compacted["audit_log"]) == 3
@@ -0,0 +1,90 @@
+"""
+Parallel load workers writing into one DuckDB file.
+
+    python -m pytest tests
+"""
+import json
+import threading
+from typing import Any, Dict, List
+
+import pytest
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pydbzengine")
+
+import dlt
+
+from benchmark_cdc import FakeChangeEvent
+from cdc_runtime import BatchWindow, DltChangeHandler, destination_lock, event_queue, metrics, process_queue
+
+TABLES = ["customers", "orders", "order_items", "payments"]
+ROUNDS = 10
+ROWS = 20
+
+
+def change_events(round_index: int) -> List[FakeChangeEvent]:
+    """Changes of every table, each round adds a column to every table."""
+    events = []
+    for table in TABLES:
+        for row_id in range(ROWS):
+            row = {"id": row_id, "version": round_index, f"column_{round_index}": row_id}
+            payload = {
+                "before": None,
+                "after": row,
+                "source": {"table": table, "lsn": round_index * 1000 + row_id, "ts_ms": 0},
+                "op": "c" if round_index == 0 else "u",
+            }
+            events.append(FakeChangeEvent(json.dumps({"id": row_id}), json.dumps({"payload": payload}), table))
+    return events
+
+
+def make_pipeline(tmp_path: Any, name: str) -> dlt.Pipeline:
+    return dlt.pipeline(
+        pipeline_name=name,
+        pipelines_dir=str(tmp_path),
+        destination=dlt.destinations.duckdb(str(tmp_path / "cdc.duckdb")),
+        dataset_name="cdc_data",
+    )
+
+
+def test_workers_share_lock_of_database_file(tmp_path: Any) -> None:
+    lock = destination_lock(make_pipeline(tmp_path, "first"))
+    assert lock is not None
+    assert destination_lock(make_pipeline(tmp_path, "second")) is lock
+
+
+def test_parallel_workers_load_schema_changes(tmp_path: Any) -> None:
+    pipeline = make_pipeline(tmp_path, "load_workers")
+    primary_keys: Dict[str, str] = {table: "id" for table in TABLES}
+    load_failures = metrics.load_failures
+    stop_event = threading.Event()
+    consumer = threading.Thread(
+        target=process_queue,
+        args=(pipeline, primary_keys, stop_event),
+        kwargs={
+            "window": BatchWindow(max_rows=len(TABLES) * ROWS, max_bytes=64 * 1024 * 1024, max_latency=0.05),
+            "load_workers": len(TABLES),
+        },
+        daemon=True,
+    )
+    consumer.start()
+    handler = DltChangeHandler()
+    try:
+        for round_index in range(ROUNDS):
+            handler.handleJsonBatch(change_events(round_index))
+        event_queue.join()
+    finally:
+        stop_event.set()
+        consumer.join()
+
+    assert metrics.load_failures == load_failures
+    with pipeline.sql_client() as client:
+        for table in TABLES:
+            rows = client.execute_sql(f"SELECT version, column_{ROUNDS - 1} FROM {table} ORDER BY id")
+            assert rows == [(ROUNDS - 1, row_id) for row_id in range(ROWS)]
+            columns = client.execute_sql(
+                "SELECT column_name FROM information_schema.columns WHERE table_schema = %s AND table_name = %s",
+                pipeline.dataset_name,
+                table,
+            )
+            assert {f"column_{index}" for index in range(ROUNDS)} <= {name for (name,) in columns}
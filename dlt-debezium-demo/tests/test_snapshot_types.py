@@ -0,0 +1,183 @@
+"""
+Bulk snapshot followed by CDC keeps the column types of the snapshot.
+
+    python -m pytest tests
+"""
+import base64
+import json
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from typing import Any, Dict, List
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pytest.importorskip("duckdb")
+pytest.importorskip("pydbzengine")
+
+import dlt
+
+from bulk_snapshot import add_cdc_columns
+from cdc_runtime import add_dlt_columns_to_arrow, create_resource, event_decoder, events_to_arrow, group_events
+
+TABLE = "test_users"
+TOPIC = f"mydb.public.{TABLE}"
+PRIMARY_KEYS = {TABLE: "id"}
+
+# column, Debezium type, logical name, parameters
+COLUMNS = [
+    ("id", "int32", None, None),
+    ("name", "string", None, None),
+    ("amount", "bytes", "org.apache.kafka.connect.data.Decimal", {"scale": "2", "connect.decimal.precision": "10"}),
+    ("birthday", "int32", "io.debezium.time.Date", None),
+    ("created_at", "int64", "io.debezium.time.MicroTimestamp", None),
+    ("updated_at", "string", "io.debezium.time.ZonedTimestamp", None),
+    ("starts_at", "int64", "io.debezium.time.MicroTime", None),
+    ("attributes", "string", "io.debezium.data.Json", None),
+]
+
+# What the `sql_database` source (pyarrow backend) yields and hints for the same PostgreSQL table
+SNAPSHOT_HINTS = {
+    "id": {"data_type": "bigint", "nullable": False},
+    "name": {"data_type": "text"},
+    "amount": {"data_type": "decimal", "precision": 10, "scale": 2},
+    "birthday": {"data_type": "date"},
+    "created_at": {"data_type": "timestamp", "timezone": False},
+    "updated_at": {"data_type": "timestamp", "timezone": True},
+    "starts_at": {"data_type": "time"},
+    "attributes": {"data_type": "json"},
+}
+
+
+def snapshot_table() -> Any:
+    return pa.table({
+        "id": pa.array([1, 2], type=pa.int32()),
+        "name": pa.array(["ann", "bob"]),
+        "amount": pa.array([Decimal("10.50"), Decimal("-3.25")], type=pa.decimal128(10, 2)),
+        "birthday": pa.array([date(1990, 1, 2), date(1985, 6, 30)], type=pa.date32()),
+        "created_at": pa.array([datetime(2024, 1, 1, 10), datetime(2024, 1, 2, 11)], type=pa.timestamp("us")),
+        "updated_at": pa.array(
+            [datetime(2024, 2, 1, tzinfo=timezone.utc), datetime(2024, 2, 2, tzinfo=timezone.utc)],
+            type=pa.timestamp("us", tz="UTC"),
+        ),
+        "starts_at": pa.array([time(8, 30), time(9, 15, 0, 500)], type=pa.time64("us")),
+        "attributes": pa.array(['{"tier": "gold"}', '{"tier": "silver"}']),
+    })
+
+
+def encode_decimal(value: Decimal, scale: int) -> str:
+    unscaled = int(value.scaleb(scale))
+    return base64.b64encode(unscaled.to_bytes((unscaled.bit_length() + 8) // 8, "big", signed=True)).decode()
+
+
+def change_record(op: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Debezium JSON change event with its envelope schema, encoded with the connector defaults."""
+    fields = []
+    for column, column_type, logical_name, parameters in COLUMNS:
+        field = {"type": column_type, "optional": column != "id", "field": column}
+        if logical_name:
+            field.update({"name": logical_name, "version": 1})
+        if parameters:
+            field["parameters"] = parameters
+        fields.append(field)
+    schema = {
+        "type": "struct",
+        "fields": [
+            {"type": "struct", "fields": fields, "optional": True, "field": "before"},
+            {"type": "struct", "fields": fields, "optional": True, "field": "after"},
+        ],
+    }
+    payload = {
+        "before": None,
+        "after": row,
+        "source": {"table": TABLE, "lsn": 100, "ts_ms": 1700000000000},
+        "op": op,
+    }
+    value = json.dumps({"schema": schema, "payload": payload})
+    return {"key": json.dumps({"id": row["id"]}), "value": value, "destination": TOPIC}
+
+
+def change_records() -> List[Dict[str, Any]]:
+    return [
+        change_record("u", {
+            "id": 1,
+            "name": "ann",
+            "amount": encode_decimal(Decimal("11.75"), 2),
+            "birthday": (date(1990, 1, 2) - date(1970, 1, 1)).days,
+            "created_at": 1704103200000000,
+            "updated_at": "2024-03-01T12:00:00.123Z",
+            "starts_at": (8 * 3600 + 45 * 60) * 1000000,
+            "attributes": '{"tier": "platinum"}',
+        }),
+        change_record("c", {
+            "id": 3,
+            "name": "cid",
+            "amount": encode_decimal(Decimal("-0.01"), 2),
+            "birthday": -365,
+            "created_at": 1709294400000000,
+            "updated_at": "2024-03-01T12:00:00Z",
+            "starts_at": 0,
+            "attributes": "{}",
+        }),
+    ]
+
+
+def column_types(pipeline: dlt.Pipeline) -> Dict[str, Any]:
+    """dlt and destination types of the table columns."""
+    with pipeline.sql_client() as client:
+        rows = client.execute_sql(
+            "SELECT column_name, data_type FROM information_schema.columns "
+            "WHERE table_schema = %s AND table_name = %s",
+            pipeline.dataset_name,
+            TABLE,
+        )
+    schema_columns = pipeline.default_schema.get_table_columns(TABLE)
+    return {
+        "schema": {
+            name: (column["data_type"], column.get("timezone"), column.get("precision"), column.get("scale"))
+            for name, column in schema_columns.items()
+        },
+        "destination": dict(rows),
+    }
+
+
+@pytest.mark.parametrize("arrow_batches", [False, True], ids=["rows", "arrow"])
+def test_cdc_keeps_snapshot_column_types(tmp_path: Any, arrow_batches: bool) -> None:
+    add_dlt_columns_to_arrow()
+    pipeline = dlt.pipeline(
+        pipeline_name="snapshot_types",
+        pipelines_dir=str(tmp_path),
+        destination=dlt.destinations.duckdb(str(tmp_path / "cdc.duckdb")),
+        dataset_name="cdc_data",
+    )
+    snapshot = dlt.resource(
+        add_cdc_columns(TABLE, merge=True)(snapshot_table()),
+        name=TABLE,
+        write_disposition="replace",
+        primary_key="id",
+        columns=SNAPSHOT_HINTS,
+    )
+    pipeline.run(snapshot)
+    snapshot_types = column_types(pipeline)
+
+    events_by_table, columns_by_table = group_events(change_records())
+    events: Any = events_by_table[TABLE]
+    if arrow_batches:
+        events = events_to_arrow(TABLE, events, event_decoder.schemas[TOPIC], merge=True)
+    pipeline.run(create_resource(TABLE, events, PRIMARY_KEYS, columns_by_table[TABLE]))
+
+    # no variant columns (e.g. `created_at__v_bigint`) and no changed types
+    assert column_types(pipeline) == snapshot_types
+
+    with pipeline.sql_client() as client:
+        rows = client.execute_sql(
+            f"SELECT id, amount, birthday, created_at, starts_at FROM {TABLE} ORDER BY id"
+        )
+    assert [row[:3] for row in rows] == [
+        (1, Decimal("11.75"), date(1990, 1, 2)),
+        (2, Decimal("-3.25"), date(1985, 6, 30)),
+        (3, Decimal("-0.01"), date(1969, 1, 1)),
+    ]
+    assert rows[0][3] == datetime(2024, 1, 1, 10)
+    assert rows[0][4] == time(8, 45)
+
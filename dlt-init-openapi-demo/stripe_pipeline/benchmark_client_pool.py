@@ -0,0 +1,101 @@
+"""
+Benchmark of the connection pool shared by the resources of a rest_api source.
+
+Serves a fake paginated API on localhost which counts new connections and
+delays each of them to simulate a TLS handshake. Compares extracting every
+resource with its own client (as rest_api did before, one source per
+resource here) with one source in which all resources share a client.
+
+    python benchmark_client_pool.py
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+from dlt.common import json
+
+from rest_api import rest_api_source
+from rest_api.typing import RESTAPIConfig
+
+RESOURCES_COUNT = 50
+PAGES_COUNT = 3
+PAGE_SIZE = 100
+# Time to set up a new connection, a TLS handshake to a remote API takes 50-200ms
+HANDSHAKE_DELAY = 0.05
+
+
+class FakeAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self) -> None:
+        super().setup()
+        with FakeAPIHandler.lock:
+            FakeAPIHandler.connections += 1
+        time.sleep(HANDSHAKE_DELAY)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        page = int(parse_qs(url.query).get("page", ["1"])[0])
+        next_url = None
+        if page < PAGES_COUNT:
+            next_url = f"http://{self.headers['Host']}{url.path}?page={page + 1}"
+
+        body = json.dumps({
+            "data": [{"id": (page - 1) * PAGE_SIZE + idx} for idx in range(PAGE_SIZE)],
+            "next": next_url,
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def make_config(base_url: str, resource_names: List[str]) -> RESTAPIConfig:
+    return {
+        "client": {
+            "base_url": base_url,
+            "paginator": {"type": "json_response", "next_url_path": "next"},
+        },
+        "resource_defaults": {"endpoint": {"data_selector": "data"}},
+        "resources": resource_names,  # type: ignore[typeddict-item]
+    }
+
+
+def measure(base_url: str, shared: bool) -> Dict[str, float]:
+    resource_names = [f"items_{idx}" for idx in range(RESOURCES_COUNT)]
+    if shared:
+        sources = [rest_api_source(make_config(base_url, resource_names), name="benchmark")]
+    else:
+        sources = [rest_api_source(make_config(base_url, [name]), name="benchmark") for name in resource_names]
+
+    FakeAPIHandler.connections = 0
+    started_at = time.perf_counter()
+    rows = sum(len(list(source)) for source in sources)
+    elapsed = time.perf_counter() - started_at
+
+    expected = RESOURCES_COUNT * PAGES_COUNT * PAGE_SIZE
+    assert rows == expected, f"Expected {expected} rows, got {rows}"
+    return {"connections": FakeAPIHandler.connections, "seconds": elapsed}
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAPIHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/"
+
+    print(f"{RESOURCES_COUNT} resources, {PAGES_COUNT} pages each, {HANDSHAKE_DELAY * 1000:.0f}ms per new connection")
+    for label, shared in (("client per resource", False), ("shared client", True)):
+        result = measure(base_url, shared)
+        print(f"{label}: {result['connections']:.0f} connections, {result['seconds']:.2f}s")
+
+    server.shutdown()
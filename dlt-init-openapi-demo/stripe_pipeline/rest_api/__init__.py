@@ -1,12 +1,18 @@
 """Generic API Source"""
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from copy import deepcopy
+from itertools import islice
 from typing import (
     Type,
     Any,
+    Deque,
     Dict,
     List,
     Optional,
     Generator,
+    Iterator,
     Callable,
     cast,
 )
@@ -23,6 +29,7 @@ from dlt.extract.incremental import Incremental
 from dlt.extract.source import DltResource, DltSource
 
 from dlt.sources.helpers.rest_client import RESTClient
+from dlt.sources.helpers.rest_client.client import PageData
 from dlt.sources.helpers.rest_client.paginators import BasePaginator
 from dlt.sources.helpers.rest_client.typing import HTTPMethodBasic
 from .typing import (
@@ -34,13 +41,15 @@ from .typing import (
 )
 from .config_setup import (
     IncrementalParam,
-    create_auth,
+    create_client,
     create_paginator,
+    get_paginator_prefetch,
     build_resource_dependency_graph,
     process_parent_data_item,
     setup_incremental_object,
     create_response_hooks,
 )
+from .prefetch import paginate_with_prefetch
 from .utils import check_connection, exclude_keys  # noqa: F401
 
 
@@ -203,6 +212,8 @@ def create_resources(
     resolved_param_map: Dict[str, Optional[ResolvedParam]],
 ) -> Dict[str, DltResource]:
     resources = {}
+    # one client (session and connection pool) shared by all resources
+    client = create_client(client_config)
 
     for resource_name in dependency_graph.static_order():
         resource_name = cast(str, resource_name)
@@ -211,6 +222,10 @@ def create_resources(
         request_params = endpoint_config.get("params", {})
         request_json = endpoint_config.get("json", None)
         paginator = create_paginator(endpoint_config.get("paginator"))
+        # without an endpoint paginator the client's one is used
+        prefetch = get_paginator_prefetch(
+            endpoint_config.get("paginator") or client_config.get("paginator")
+        )
 
         resolved_param: ResolvedParam = resolved_param_map[resource_name]
 
@@ -228,13 +243,6 @@ def create_resources(
             incremental_param,
         ) = setup_incremental_object(request_params, endpoint_config.get("incremental"))
 
-        client = RESTClient(
-            base_url=client_config["base_url"],
-            headers=client_config.get("headers"),
-            auth=create_auth(client_config.get("auth")),
-            paginator=create_paginator(client_config.get("paginator")),
-        )
-
         hooks = create_response_hooks(endpoint_config.get("response_actions"))
 
         resource_kwargs = exclude_keys(
@@ -254,13 +262,16 @@ def create_resources(
                 client: RESTClient = client,
                 incremental_object: Optional[Incremental[Any]] = incremental_object,
                 incremental_param: IncrementalParam = incremental_param,
+                prefetch: int = prefetch,
             ) -> Generator[Any, None, None]:
                 if incremental_object:
                     params[incremental_param.start] = incremental_object.last_value
                     if incremental_param.end:
                         params[incremental_param.end] = incremental_object.end_value
 
-                yield from client.paginate(
+                yield from paginate_with_prefetch(
+                    client,
+                    prefetch,
                     method=method,
                     path=path,
                     params=params,
@@ -287,6 +298,7 @@ def create_resources(
             predecessor = resources[resolved_param.resolve_config["resource"]]
 
             base_params = exclude_keys(request_params, {resolved_param.param_name})
+            concurrency = endpoint_config.get("concurrency") or 1
 
             def paginate_dependent_resource(
                 items: List[Dict[str, Any]],
@@ -301,13 +313,18 @@ def create_resources(
                 include_from_parent: List[str] = include_from_parent,
                 incremental_object: Optional[Incremental[Any]] = incremental_object,
                 incremental_param: IncrementalParam = incremental_param,
+                concurrency: int = concurrency,
             ) -> Generator[Any, None, None]:
                 if incremental_object:
                     params[incremental_param.start] = incremental_object.last_value
                     if incremental_param.end:
                         params[incremental_param.end] = incremental_object.end_value
 
-                for item in items:
+                def paginate_child(
+                    item: Dict[str, Any],
+                    params: Dict[str, Any] = params,
+                    paginator: Optional[BasePaginator] = paginator,
+                ) -> Iterator[PageData[Any]]:
                     formatted_path, parent_record = process_parent_data_item(
                         path, item, resolved_param, include_from_parent
                     )
@@ -325,6 +342,39 @@ def create_resources(
                                 child_record.update(parent_record)
                         yield child_page
 
+                if concurrency <= 1:
+                    for item in items:
+                        yield from paginate_child(item)
+                    return
+
+                def fetch_child_pages(item: Dict[str, Any]) -> List[PageData[Any]]:
+                    # paginators and params are updated while paginating, each
+                    # child request chain gets its own copy
+                    return list(
+                        paginate_child(item, dict(params), deepcopy(paginator))
+                    )
+
+                # children of a parent page are fetched concurrently, pages are
+                # yielded in the order of parent items. At most `concurrency * 2`
+                # children are in flight, so only their pages are kept in memory
+                pending = iter(items)
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    in_flight: Deque[Future[List[PageData[Any]]]] = deque(
+                        executor.submit(fetch_child_pages, item)
+                        for item in islice(pending, concurrency * 2)
+                    )
+                    try:
+                        while in_flight:
+                            child_pages = in_flight.popleft().result()
+                            for item in islice(pending, 1):
+                                in_flight.append(
+                                    executor.submit(fetch_child_pages, item)
+                                )
+                            yield from child_pages
+                    finally:
+                        for future in in_flight:
+                            future.cancel()
+
             resources[resource_name] = dlt.resource(  # type: ignore[call-overload]
                 paginate_dependent_resource,
                 data_from=predecessor,
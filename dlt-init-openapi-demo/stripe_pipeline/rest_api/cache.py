@@ -0,0 +1,223 @@
+import hashlib
+import io
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from requests.adapters import BaseAdapter  # noqa: I251
+from requests.structures import CaseInsensitiveDict  # noqa: I251
+
+from dlt.common import json, logger
+from dlt.common.configuration.paths import get_dlt_data_dir
+from dlt.sources.helpers.requests import Response
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+DEFAULT_CACHED_METHODS = ("GET", "HEAD")
+
+
+def default_cache_path() -> str:
+    return os.path.join(get_dlt_data_dir(), "rest_api_cache")
+
+
+class ResponseCache:
+    """On disk cache of successful responses keyed by method, URL (with params),
+    request headers and body. Only requests with one of `methods` are cached.
+
+    Entries younger than `ttl` seconds are replayed without a request. Older
+    entries with an `ETag` are revalidated with `If-None-Match` and replayed
+    when the API answers `304 Not Modified`. When the cache outgrows `max_size`
+    bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        path: Optional[str] = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        methods: Sequence[str] = DEFAULT_CACHED_METHODS,
+    ) -> None:
+        if ttl is None or ttl <= 0:
+            raise ValueError("Response cache needs a positive `ttl` in seconds")
+        self.path = path or default_cache_path()
+        self.ttl = ttl
+        self.max_size = max_size
+        self.methods = tuple(method.upper() for method in methods)
+        os.makedirs(self.path, exist_ok=True)
+        self._lock = threading.Lock()
+        # key -> (size in bytes, last access time)
+        self._entries: Dict[str, Tuple[int, float]] = {}
+        self._size = 0
+        for file_name in os.listdir(self.path):
+            if file_name.endswith(".json"):
+                key = file_name[: -len(".json")]
+                size, accessed_at = self._entry_stat(key)
+                if size:
+                    self._entries[key] = (size, accessed_at)
+                    self._size += size
+        if self._size > self.max_size:
+            self._evict()
+
+    @staticmethod
+    def make_key(request: Any) -> str:
+        # all request headers go into the key: responses for other credentials
+        # (`Authorization`, api key headers, cookies) or for other values of the
+        # headers a response `Vary`s on are never replayed
+        headers = sorted(
+            (name.lower(), value) for name, value in request.headers.items()
+        )
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        digest = hashlib.sha256(f"{request.method.upper()} {request.url}\n".encode("utf-8"))
+        for name, value in headers:
+            digest.update(f"{name}: {value}\n".encode("utf-8"))
+        digest.update(b"\n")
+        digest.update(body)
+        return digest.hexdigest()
+
+    def is_cacheable(self, request: Any) -> bool:
+        return request.method.upper() in self.methods
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """Returns the metadata and body of a cached response"""
+        try:
+            with open(self._meta_path(key), "rb") as f:
+                meta = json.loadb(f.read())
+            with open(self._body_path(key), "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        self.touch(key)
+        return meta, body
+
+    def is_fresh(self, meta: Dict[str, Any]) -> bool:
+        return time.time() - meta["stored_at"] < self.ttl
+
+    def put(self, key: str, response: Response) -> None:
+        meta = {
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+            "etag": response.headers.get("ETag"),
+            "stored_at": time.time(),
+        }
+        self._write(self._body_path(key), response.content)
+        self._write(self._meta_path(key), json.dumpb(meta))
+        self._add_entry(key)
+
+    def refresh(self, key: str, meta: Dict[str, Any]) -> None:
+        """Restarts the `ttl` of a revalidated entry"""
+        meta["stored_at"] = time.time()
+        self._write(self._meta_path(key), json.dumpb(meta))
+        self._add_entry(key)
+
+    def touch(self, key: str) -> None:
+        # access time is also kept as mtime of the meta file,
+        # so entries are evicted by last access across runs
+        accessed_at = time.time()
+        try:
+            os.utime(self._meta_path(key), (accessed_at, accessed_at))
+        except OSError:
+            pass
+        with self._lock:
+            if key in self._entries:
+                self._entries[key] = (self._entries[key][0], accessed_at)
+
+    def _add_entry(self, key: str) -> None:
+        size, _ = self._entry_stat(key)
+        with self._lock:
+            previous_size, _ = self._entries.get(key, (0, 0.0))
+            self._entries[key] = (size, time.time())
+            self._size += size - previous_size
+            if self._size > self.max_size:
+                self._evict()
+
+    def _evict(self) -> None:
+        # oldest access first, called under the lock
+        for key, (size, _) in sorted(self._entries.items(), key=lambda entry: entry[1][1]):
+            if self._size <= self.max_size:
+                break
+            for file_path in (self._meta_path(key), self._body_path(key)):
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass
+            del self._entries[key]
+            self._size -= size
+
+    def _entry_stat(self, key: str) -> Tuple[int, float]:
+        try:
+            meta_stat = os.stat(self._meta_path(key))
+            return meta_stat.st_size + os.path.getsize(self._body_path(key)), meta_stat.st_mtime
+        except OSError:
+            return 0, 0.0
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.path, key + ".json")
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.path, key + ".body")
+
+    @staticmethod
+    def _write(file_path: str, content: bytes) -> None:
+        # write to a temp file and replace, readers never see partial files
+        temp_path = f"{file_path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, file_path)
+
+
+class CachingAdapter(BaseAdapter):
+    """HTTP adapter answering from `cache` and sending misses through `adapter`."""
+
+    def __init__(self, cache: ResponseCache, adapter: BaseAdapter) -> None:
+        super().__init__()
+        self.cache = cache
+        self.adapter = adapter
+
+    def send(self, request: Any, stream: bool = False, **kwargs: Any) -> Response:  # type: ignore[override]
+        if stream or not self.cache.is_cacheable(request):
+            return self.adapter.send(request, stream=stream, **kwargs)
+
+        key = self.cache.make_key(request)
+        cached = self.cache.get(key)
+        if cached:
+            meta, body = cached
+            if self.cache.is_fresh(meta):
+                logger.info(f"Replaying cached response for {request.method} {request.url}")
+                return self._build_response(request, meta, body)
+            if meta.get("etag"):
+                request = request.copy()
+                request.headers["If-None-Match"] = meta["etag"]
+
+        response = self.adapter.send(request, stream=stream, **kwargs)
+        if cached and response.status_code == 304:
+            response.close()
+            self.cache.refresh(key, meta)
+            return self._build_response(request, meta, body)
+        # `Vary: *` means the response depends on more than the request
+        if response.status_code == 200 and response.headers.get("Vary", "").strip() != "*":
+            try:
+                self.cache.put(key, response)
+            except OSError as ex:
+                logger.warning(f"Could not cache response for {request.url}: {ex}")
+        return response
+
+    def _build_response(self, request: Any, meta: Dict[str, Any], body: bytes) -> Response:
+        response = Response()
+        response.status_code = meta["status_code"]
+        response.reason = meta["reason"]
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = meta["encoding"]
+        response._content = body
+        response._content_consumed = True
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self) -> None:
+        self.adapter.close()
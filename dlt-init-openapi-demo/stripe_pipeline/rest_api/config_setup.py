@@ -24,7 +24,8 @@ from dlt.common import jsonpath
 from dlt.extract.incremental import Incremental
 from dlt.extract.utils import ensure_table_schema_columns
 
-from dlt.sources.helpers.requests import Response
+from dlt.sources.helpers.requests import Response, Client
+from dlt.sources.helpers.rest_client import RESTClient
 from dlt.sources.helpers.rest_client.paginators import (
     BasePaginator,
     SinglePagePaginator,
@@ -49,16 +50,21 @@ from .typing import (
     PaginatorType,
     AuthType,
     AuthConfig,
+    ClientConfig,
     IncrementalArgs,
     IncrementalConfig,
     PaginatorConfig,
     ParamBindConfig,
+    RateLimitConfig,
+    ResponseCacheConfig,
     ResolveParamConfig,
     ResolvedParam,
     ResponseAction,
     Endpoint,
     EndpointResource,
 )
+from .cache import CachingAdapter, ResponseCache
+from .rate_limit import RateLimitedAdapter, RateLimiter
 from .utils import exclude_keys
 
 
@@ -72,6 +78,9 @@ PAGINATOR_MAP: Dict[PaginatorType, Type[BasePaginator]] = {
     "page_number": PageNumberPaginator,
 }
 
+# connections per host in the pool of the shared session
+DEFAULT_POOL_SIZE = 50
+
 AUTH_MAP: Dict[AuthType, Type[AuthConfigBase]] = {
     "bearer": BearerTokenAuth,
     "api_key": APIKeyAuth,
@@ -115,7 +124,7 @@ def create_paginator(
         paginator_type = paginator_config.get("type", "auto")
         paginator_class = get_paginator_class(paginator_type)
         return (
-            paginator_class(**exclude_keys(paginator_config, {"type"}))
+            paginator_class(**exclude_keys(paginator_config, {"type", "prefetch"}))
             if paginator_class
             else None
         )
@@ -123,6 +132,13 @@ def create_paginator(
     return None
 
 
+def get_paginator_prefetch(paginator_config: Optional[PaginatorConfig]) -> int:
+    """Returns the number of pages to prefetch set in the paginator config"""
+    if isinstance(paginator_config, dict):
+        return paginator_config.get("prefetch") or 0
+    return 0
+
+
 def get_auth_class(auth_type: AuthType) -> Type[AuthConfigBase]:
     try:
         return AUTH_MAP[auth_type]
@@ -156,6 +172,81 @@ def create_auth(auth_config: Optional[AuthConfig]) -> Optional[AuthConfigBase]:
     return None
 
 
+def create_rate_limiter(
+    rate_limit_config: Optional[Union[RateLimitConfig, RateLimiter]],
+) -> Optional[RateLimiter]:
+    if isinstance(rate_limit_config, RateLimiter):
+        return rate_limit_config
+
+    if isinstance(rate_limit_config, dict):
+        return RateLimiter(
+            **{key: value for key, value in rate_limit_config.items() if value is not None}
+        )
+
+    return None
+
+
+def create_response_cache(
+    cache_config: Optional[Union[ResponseCacheConfig, ResponseCache]],
+) -> Optional[ResponseCache]:
+    if isinstance(cache_config, ResponseCache):
+        return cache_config
+
+    if isinstance(cache_config, dict):
+        if not cache_config.get("ttl"):
+            raise ValueError(
+                "Response cache needs a `ttl`: seconds after which a cached"
+                " response is requested again"
+            )
+        return ResponseCache(
+            **{key: value for key, value in cache_config.items() if value is not None}
+        )
+
+    return None
+
+
+def create_client(client_config: ClientConfig) -> RESTClient:
+    """Creates the client shared by all resources of a source.
+
+    All requests go through one session, so connections (and TLS handshakes)
+    to the API host are pooled and reused across resources instead of every
+    resource opening its own. The session's connection pool is thread-safe and
+    holds up to `pool_size` connections per host, set it to at least the number
+    of resources extracted in parallel. A custom `session` is used as is.
+
+    With `rate_limit`, requests are scheduled by a `RateLimiter` wrapping the
+    session's adapters, so its token bucket and concurrency are shared by all
+    resources. With `cache`, responses are replayed from disk before reaching
+    the limiter. The wrappers of a custom session passed to an earlier client
+    are replaced, not stacked.
+    """
+    pool_size = client_config.get("pool_size") or DEFAULT_POOL_SIZE
+    session = client_config.get("session")
+    if session is None:
+        session = Client(raise_for_status=False, max_connections=pool_size).session
+
+    rate_limiter = create_rate_limiter(client_config.get("rate_limit"))
+    response_cache = create_response_cache(client_config.get("cache"))
+    if rate_limiter or response_cache:
+        for prefix, adapter in list(session.adapters.items()):
+            while isinstance(adapter, (CachingAdapter, RateLimitedAdapter)):
+                adapter = adapter.adapter
+            if rate_limiter:
+                # every request and retry of every resource waits for the shared limiter
+                adapter = RateLimitedAdapter(rate_limiter, adapter)
+            if response_cache:
+                adapter = CachingAdapter(response_cache, adapter)
+            session.mount(prefix, adapter)
+
+    return RESTClient(
+        base_url=client_config["base_url"],
+        headers=client_config.get("headers"),
+        auth=create_auth(client_config.get("auth")),
+        paginator=create_paginator(client_config.get("paginator")),
+        session=session,
+    )
+
+
 def setup_incremental_object(
     request_params: Dict[str, Any],
     incremental_config: Optional[IncrementalConfig] = None,
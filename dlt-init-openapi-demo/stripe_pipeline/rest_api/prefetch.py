@@ -0,0 +1,166 @@
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Empty, Full, Queue
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from dlt.common import jsonpath
+
+from dlt.sources.helpers.rest_client import RESTClient
+from dlt.sources.helpers.rest_client.client import PageData
+from dlt.sources.helpers.rest_client.paginators import (
+    RangePaginator,
+    SinglePagePaginator,
+)
+
+# seconds between checks if the consumer stopped while waiting on the queue
+_POLL_INTERVAL = 0.1
+_DONE = object()
+
+
+class _Failed:
+    def __init__(self, exception: BaseException) -> None:
+        self.exception = exception
+
+
+def paginate_with_prefetch(
+    client: RESTClient, prefetch: int, **paginate_kwargs: Any
+) -> Iterator[PageData[Any]]:
+    """Paginates like `client.paginate` while keeping up to `prefetch` pages in
+    flight, so the next pages are downloaded while the current one is extracted.
+
+    When the first page of an offset or page number paginator tells the last
+    page (`total_path` or the maximum offset/page), the remaining pages are
+    requested in parallel. Other paginators need the previous response to
+    build the next request, their pages are requested one after another in a
+    background thread, as soon as the previous page is parsed.
+    Pages are yielded in order.
+    """
+    if prefetch < 1:
+        yield from client.paginate(**paginate_kwargs)
+        return
+
+    pages = client.paginate(**paginate_kwargs)
+    first_page = next(pages, None)
+    if first_page is None:
+        return
+    yield first_page
+
+    paginator = first_page.paginator
+    if isinstance(paginator, RangePaginator) and paginator.has_next_page:
+        last_value = _range_end(paginator, first_page)
+        if last_value is not None:
+            pages.close()
+            yield from _fetch_range_pages(
+                client, prefetch, paginator, first_page, last_value, paginate_kwargs
+            )
+            return
+
+    yield from _prefetch_in_background(pages, prefetch)
+
+
+def _range_end(paginator: RangePaginator, page: PageData[Any]) -> Optional[int]:
+    """Value of the paginator's param at which the pagination stops, the
+    same bound the paginator's `update_state` checks. Newer dlt versions count
+    the total from `base_index`, i.e. pages numbered from `base_page=1`.
+    """
+    if getattr(paginator, "has_more_path", None):
+        # only the response of every page tells if there is a next one
+        return None
+    end = paginator.maximum_value
+    if paginator.total_path:
+        values = jsonpath.find_values(paginator.total_path, page.response.json())
+        if values and values[0] is not None:
+            total = int(values[0]) + getattr(paginator, "base_index", 0)
+            end = total if end is None else min(end, total)
+    return end
+
+
+def _fetch_range_pages(
+    client: RESTClient,
+    prefetch: int,
+    paginator: RangePaginator,
+    first_page: PageData[Any],
+    last_value: int,
+    paginate_kwargs: Dict[str, Any],
+) -> Iterator[PageData[Any]]:
+    # the request of the first page has the params of the next one, including limit
+    params = dict(first_page.request.params or {})
+    values = iter(range(paginator.current_value, last_value, paginator.value_step))
+
+    def fetch_page(value: int) -> List[PageData[Any]]:
+        page_kwargs = {
+            **paginate_kwargs,
+            "params": {**params, paginator.param_name: value},
+            "paginator": SinglePagePaginator(),
+        }
+        # hooks are extended by `paginate`, each request gets its own dict
+        if page_kwargs.get("hooks"):
+            page_kwargs["hooks"] = dict(page_kwargs["hooks"])
+        return list(client.paginate(**page_kwargs))
+
+    # newer dlt versions stop at the first empty page even if the total tells otherwise
+    stop_after_empty_page = getattr(paginator, "stop_after_empty_page", False)
+
+    with ThreadPoolExecutor(max_workers=prefetch) as executor:
+        in_flight: Deque[Future[List[PageData[Any]]]] = deque(
+            executor.submit(fetch_page, value)
+            for _, value in zip(range(prefetch), values)
+        )
+        try:
+            while in_flight:
+                pages = in_flight.popleft().result()
+                value = next(values, None)
+                if value is not None:
+                    in_flight.append(executor.submit(fetch_page, value))
+                yield from pages
+                if stop_after_empty_page and not any(pages):
+                    return
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+
+def _prefetch_in_background(
+    pages: Iterator[PageData[Any]], prefetch: int
+) -> Iterator[PageData[Any]]:
+    queue: Queue[Any] = Queue(maxsize=prefetch)
+    stopped = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                queue.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for page in pages:
+                if not put(page):
+                    # consumer is gone, stop paginating
+                    pages.close()  # type: ignore[attr-defined]
+                    return
+            put(_DONE)
+        except BaseException as ex:
+            put(_Failed(ex))
+
+    producer = threading.Thread(target=produce, name="rest_api_prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            try:
+                item = queue.get(timeout=_POLL_INTERVAL)
+            except Empty:
+                if not producer.is_alive() and queue.empty():
+                    return
+                continue
+            if item is _DONE:
+                return
+            if isinstance(item, _Failed):
+                raise item.exception
+            yield item
+    finally:
+        stopped.set()
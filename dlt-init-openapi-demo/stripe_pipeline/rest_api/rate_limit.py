@@ -0,0 +1,217 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+from requests.adapters import BaseAdapter  # noqa: I251
+
+from dlt.common import logger
+from dlt.sources.helpers.requests import Response
+
+DEFAULT_MAX_CONCURRENCY = 8
+# seconds without throttling after which concurrency and rate are raised
+RECOVERY_INTERVAL = 1.0
+# response headers with the request budget left in the current window and its reset
+REMAINING_HEADERS = ("X-RateLimit-Remaining", "RateLimit-Remaining")
+RESET_HEADERS = ("X-RateLimit-Reset", "RateLimit-Reset")
+THROTTLED_STATUS_CODES = (429, 503)
+
+
+def _header_value(response: Response, names: Any) -> Optional[float]:
+    for name in names:
+        value = response.headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Returns seconds to wait from a `Retry-After` header (seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_reset(value: float) -> float:
+    """Returns seconds until a rate limit window resets. `X-RateLimit-Reset` is
+    either seconds until the reset or the reset time as unix epoch (s or ms).
+    """
+    if value > 1e12:
+        value = value / 1000
+    if value > 1e9:
+        return max(value - time.time(), 0.0)
+    return value
+
+
+class RateLimiter:
+    """Schedules the requests of all resources sharing a client.
+
+    A token bucket refilled at `requests_per_second` (`burst` tokens at most)
+    spaces requests out and at most `concurrency` requests are in flight.
+    The limits adapt to the API's responses:
+
+    * `Retry-After` on 429/503 pauses all requests for the given time, a
+      throttled response halves the concurrency and the request rate
+    * `X-RateLimit-Remaining` / `X-RateLimit-Reset` (or `RateLimit-*`) give
+      the requests left in the current window, requests wait for the reset
+      when none are left
+    * each second without throttling, concurrency grows by one and the rate
+      by a tenth of `requests_per_second`, up to `max_concurrency` and
+      `requests_per_second`
+
+    Without `requests_per_second` only the budget reported by the API and
+    throttled responses limit the rate.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        self.max_rate = requests_per_second
+        self.rate = requests_per_second
+        self.burst = burst or 1
+        self.max_concurrency = max(max_concurrency, 1)
+        self.concurrency = self.max_concurrency
+        self.tokens = float(self.burst)
+        self.refilled_at = time.monotonic()
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.recovered_at = time.monotonic()
+        self.throttled_at = 0.0
+        # requests left until the API's rate limit window resets
+        self.budget: Optional[float] = None
+        self.budget_resets_at = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Blocks until a request may be sent."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self.budget is not None and now >= self.budget_resets_at:
+                    self.budget = None
+                if now < self.paused_until:
+                    timeout: Optional[float] = self.paused_until - now
+                elif self.in_flight >= self.concurrency:
+                    # woken up by `release`
+                    timeout = None
+                elif self.budget is not None and self.budget < 1:
+                    timeout = self.budget_resets_at - now
+                elif self.rate is not None and self.tokens < 1:
+                    timeout = (1 - self.tokens) / self.rate
+                else:
+                    if self.rate is not None:
+                        self.tokens -= 1
+                    if self.budget is not None:
+                        self.budget -= 1
+                    self.in_flight += 1
+                    return
+                self._condition.wait(timeout)
+
+    def release(self, response: Optional[Response]) -> None:
+        """Frees the request slot and adapts the limits to `response`."""
+        with self._condition:
+            self.in_flight -= 1
+            if response is not None:
+                self._update(response)
+            self._condition.notify_all()
+
+    def _refill(self, now: float) -> None:
+        if self.rate is not None:
+            self.tokens = min(
+                self.tokens + (now - self.refilled_at) * self.rate, self.burst
+            )
+        self.refilled_at = now
+
+    def _set_rate(self, rate: float) -> None:
+        if self.max_rate is not None:
+            rate = min(rate, self.max_rate)
+        if self.rate is None:
+            # bucket starts empty when the rate becomes limited
+            self.tokens = 0.0
+        self.rate = max(rate, 0.01)
+
+    def _pause(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def _update(self, response: Response) -> None:
+        if response.status_code in THROTTLED_STATUS_CODES:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if response.status_code == 429 or retry_after is not None:
+                self._throttled(retry_after)
+                return
+
+        remaining = _header_value(response, REMAINING_HEADERS)
+        reset = _header_value(response, RESET_HEADERS)
+        if remaining is not None and reset is not None:
+            self._update_budget(remaining, parse_reset(reset))
+
+        now = time.monotonic()
+        if response.status_code < 400 and now - self.recovered_at >= RECOVERY_INTERVAL:
+            self.recovered_at = now
+            if self.concurrency < self.max_concurrency:
+                self.concurrency += 1
+            if self.rate is not None and self.max_rate is not None:
+                self._set_rate(self.rate + self.max_rate / 10)
+
+    def _update_budget(self, remaining: float, reset_in: float) -> None:
+        now = time.monotonic()
+        # requests still in flight are not counted in `remaining` yet
+        budget = remaining - self.in_flight
+        if self.budget is not None and now < self.budget_resets_at:
+            # responses may arrive out of order, keep the lower budget of the window
+            budget = min(budget, self.budget)
+        self.budget = budget
+        self.budget_resets_at = now + reset_in
+
+    def _throttled(self, retry_after: Optional[float]) -> None:
+        now = time.monotonic()
+        if retry_after is not None:
+            self._pause(retry_after)
+        if now - self.throttled_at < RECOVERY_INTERVAL:
+            # requests sent before the limits were lowered are throttled too
+            return
+        self.throttled_at = self.recovered_at = now
+        self.concurrency = max(self.concurrency // 2, 1)
+        if self.rate is not None:
+            self._set_rate(self.rate / 2)
+        logger.warning(
+            f"Request throttled, lowering concurrency to {self.concurrency}"
+            + (f" and rate to {self.rate:.2f} req/s" if self.rate is not None else "")
+            + (f", pausing for {retry_after:.1f}s" if retry_after else "")
+        )
+
+
+class RateLimitedAdapter(BaseAdapter):
+    """HTTP adapter sending every request (including retries) through `limiter`
+    to `adapter`."""
+
+    def __init__(self, limiter: RateLimiter, adapter: BaseAdapter) -> None:
+        super().__init__()
+        self.limiter = limiter
+        self.adapter = adapter
+
+    def send(self, request: Any, **kwargs: Any) -> Response:  # type: ignore[override]
+        self.limiter.acquire()
+        response = None
+        try:
+            response = self.adapter.send(request, **kwargs)
+            return response
+        finally:
+            self.limiter.release(response)
+
+    def close(self) -> None:
+        self.adapter.close()
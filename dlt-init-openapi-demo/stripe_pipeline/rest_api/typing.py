@@ -9,6 +9,8 @@ from typing import (
 )
 from dataclasses import dataclass, field
 
+from requests import Session as BaseSession  # noqa: I251
+
 from dlt.common import jsonpath
 from dlt.common.typing import TSortOrder
 from dlt.common.schema.typing import (
@@ -43,6 +45,9 @@ from dlt.sources.helpers.rest_client.auth import (
     OAuthJWTAuth,
 )
 
+from .cache import ResponseCache
+from .rate_limit import RateLimiter
+
 PaginatorType = Literal[
     "json_response",
     "header_link",
@@ -58,7 +63,13 @@ class PaginatorTypeConfig(TypedDict, total=True):
     type: PaginatorType  # noqa
 
 
-class PageNumberPaginatorConfig(PaginatorTypeConfig, total=False):
+class PrefetchPaginatorConfig(PaginatorTypeConfig, total=False):
+    """Number of pages requested ahead of the page being extracted"""
+
+    prefetch: Optional[int]
+
+
+class PageNumberPaginatorConfig(PrefetchPaginatorConfig, total=False):
     """A paginator that uses page number-based pagination strategy."""
 
     initial_page: Optional[int]
@@ -67,7 +78,7 @@ class PageNumberPaginatorConfig(PaginatorTypeConfig, total=False):
     maximum_page: Optional[int]
 
 
-class OffsetPaginatorConfig(PaginatorTypeConfig, total=False):
+class OffsetPaginatorConfig(PrefetchPaginatorConfig, total=False):
     """A paginator that uses offset-based pagination strategy."""
 
     limit: int
@@ -78,21 +89,21 @@ class OffsetPaginatorConfig(PaginatorTypeConfig, total=False):
     maximum_offset: Optional[int]
 
 
-class HeaderLinkPaginatorConfig(PaginatorTypeConfig, total=False):
+class HeaderLinkPaginatorConfig(PrefetchPaginatorConfig, total=False):
     """A paginator that uses the 'Link' header in HTTP responses
     for pagination."""
 
     links_next_key: Optional[str]
 
 
-class JSONResponsePaginatorConfig(PaginatorTypeConfig, total=False):
+class JSONResponsePaginatorConfig(PrefetchPaginatorConfig, total=False):
     """Locates the next page URL within the JSON response body. The key
     containing the URL can be specified using a JSON path."""
 
     next_url_path: Optional[jsonpath.TJsonPath]
 
 
-class JSONResponseCursorPaginatorConfig(PaginatorTypeConfig, total=False):
+class JSONResponseCursorPaginatorConfig(PrefetchPaginatorConfig, total=False):
     """Uses a cursor parameter for pagination, with the cursor value found in
     the JSON response body."""
 
@@ -163,11 +174,32 @@ AuthConfig = Union[
 ]
 
 
+class RateLimitConfig(TypedDict, total=False):
+    """Limits of the requests scheduler shared by all resources of a source"""
+
+    requests_per_second: Optional[Union[int, float]]
+    burst: Optional[int]
+    max_concurrency: Optional[int]
+
+
+class ResponseCacheConfig(TypedDict, total=False):
+    """On disk cache of API responses"""
+
+    ttl: Union[int, float]
+    path: Optional[str]
+    max_size: Optional[int]
+    methods: Optional[List[str]]
+
+
 class ClientConfig(TypedDict, total=False):
     base_url: str
     headers: Optional[Dict[str, str]]
     auth: Optional[AuthConfig]
     paginator: Optional[PaginatorConfig]
+    session: Optional[BaseSession]
+    pool_size: Optional[int]
+    rate_limit: Optional[Union[RateLimitConfig, RateLimiter]]
+    cache: Optional[Union[ResponseCacheConfig, ResponseCache]]
 
 
 class IncrementalArgs(TypedDict, total=False):
@@ -227,6 +259,7 @@ class Endpoint(TypedDict, total=False):
     data_selector: Optional[jsonpath.TJsonPath]
     response_actions: Optional[List[ResponseAction]]
     incremental: Optional[IncrementalConfig]
+    concurrency: Optional[int]
 
 
 class ResourceBase(TypedDict, total=False):
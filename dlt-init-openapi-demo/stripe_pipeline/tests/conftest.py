@@ -0,0 +1,61 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from dlt.common import json
+
+# handler gets path, query params and request headers and returns status, headers and json body
+Handler = Callable[[str, Dict[str, str], Dict[str, str]], Tuple[int, Dict[str, str], Any]]
+
+
+class FakeAPI:
+    """Serves `handler` on localhost and records requests"""
+
+    def __init__(self) -> None:
+        self.handler: Optional[Handler] = None
+        self.requests: List[Tuple[str, Dict[str, str], Dict[str, str]]] = []
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/"
+
+    def _handler_class(self) -> Any:
+        api = self
+
+        class FakeAPIHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                params = {name: values[0] for name, values in parse_qs(url.query).items()}
+                headers = dict(self.headers.items())
+                with api.lock:
+                    api.requests.append((url.path, params, headers))
+                assert api.handler
+                status, response_headers, data = api.handler(url.path, params, headers)
+                body = b"" if data is None else json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                for name, value in response_headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return FakeAPIHandler
+
+
+@pytest.fixture
+def fake_api() -> Iterator[FakeAPI]:
+    api = FakeAPI()
+    thread = threading.Thread(target=api.server.serve_forever, daemon=True)
+    thread.start()
+    yield api
+    api.server.shutdown()
+    api.server.server_close()
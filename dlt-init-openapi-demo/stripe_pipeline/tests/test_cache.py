@@ -0,0 +1,94 @@
+import os
+import time
+from typing import Any, Dict
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from rest_api.cache import CachingAdapter, ResponseCache
+
+
+def make_session(cache: ResponseCache) -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", CachingAdapter(cache, HTTPAdapter()))
+    return session
+
+
+def etag_handler(path: str, params: Dict[str, str], headers: Dict[str, str]) -> Any:
+    etag = f'"{path}"'
+    if headers.get("If-None-Match") == etag:
+        return 304, {"ETag": etag}, None
+    return 200, {"ETag": etag}, {"path": path}
+
+
+def test_requires_ttl(tmp_path: Any) -> None:
+    with pytest.raises(ValueError):
+        ResponseCache(ttl=None, path=str(tmp_path))  # type: ignore[arg-type]
+
+
+def test_replays_fresh_and_revalidates_stale(fake_api: Any, tmp_path: Any) -> None:
+    fake_api.handler = etag_handler
+    cache = ResponseCache(ttl=60, path=str(tmp_path))
+    session = make_session(cache)
+
+    assert session.get(fake_api.base_url + "items").json() == {"path": "/items"}
+    assert session.get(fake_api.base_url + "items").json() == {"path": "/items"}
+    assert len(fake_api.requests) == 1
+
+    cache.ttl = 0.001
+    time.sleep(0.01)
+    response = session.get(fake_api.base_url + "items")
+    assert response.status_code == 200
+    assert response.json() == {"path": "/items"}
+    assert fake_api.requests[-1][2]["If-None-Match"] == '"/items"'
+
+
+def test_replayed_response_can_be_streamed(fake_api: Any, tmp_path: Any) -> None:
+    fake_api.handler = etag_handler
+    session = make_session(ResponseCache(ttl=60, path=str(tmp_path)))
+    body = session.get(fake_api.base_url + "items").content
+
+    replayed = session.get(fake_api.base_url + "items")
+    assert len(fake_api.requests) == 1
+    assert b"".join(replayed.iter_content(chunk_size=4)) == body
+    assert replayed.raw.read() == body
+
+
+def test_caches_only_listed_methods(fake_api: Any, tmp_path: Any) -> None:
+    cache = ResponseCache(ttl=60, path=str(tmp_path))
+    request = requests.Request("POST", fake_api.base_url + "search", data=b"{}").prepare()
+    assert not cache.is_cacheable(request)
+    cache = ResponseCache(ttl=60, path=str(tmp_path), methods=("get", "post"))
+    assert cache.is_cacheable(request)
+
+
+def test_key_depends_on_credentials(fake_api: Any, tmp_path: Any) -> None:
+    fake_api.handler = etag_handler
+    session = make_session(ResponseCache(ttl=60, path=str(tmp_path)))
+
+    session.get(fake_api.base_url + "items", headers={"Authorization": "Bearer a"})
+    session.get(fake_api.base_url + "items", headers={"Authorization": "Bearer b"})
+    session.get(fake_api.base_url + "items", headers={"Authorization": "Bearer a"})
+    assert len(fake_api.requests) == 2
+
+
+def test_evicts_least_recently_used_across_runs(fake_api: Any, tmp_path: Any) -> None:
+    fake_api.handler = etag_handler
+    cache = ResponseCache(ttl=60, path=str(tmp_path))
+    session = make_session(cache)
+    keys: Dict[str, str] = {}
+    for path in ("first", "second"):
+        session.get(fake_api.base_url + path)
+        keys[path] = (set(cache._entries) - set(keys.values())).pop()
+        time.sleep(0.05)
+    # first is used after second was stored
+    session.get(fake_api.base_url + "first")
+    assert len(fake_api.requests) == 2
+
+    # new cache over the same directory keeps access order, evicting one entry evicts second
+    entry_size = max(size for size, _ in cache._entries.values())
+    restarted = ResponseCache(ttl=60, path=str(tmp_path), max_size=cache._size - entry_size // 2)
+    assert keys["first"] in restarted._entries
+    assert keys["second"] not in restarted._entries
+    assert not os.path.exists(restarted._meta_path(keys["second"]))
@@ -0,0 +1,87 @@
+import inspect
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+
+from dlt.sources.helpers.rest_client import RESTClient
+from dlt.sources.helpers.rest_client.paginators import (
+    BasePaginator,
+    OffsetPaginator,
+    PageNumberPaginator,
+)
+
+from rest_api.prefetch import paginate_with_prefetch
+
+# newer dlt versions number pages from `base_page` and count the total from it
+HAS_BASE_PAGE = "base_page" in inspect.signature(PageNumberPaginator).parameters
+
+
+def offset_api(available: int, total: int) -> Callable[..., Any]:
+    def handler(path: str, params: Dict[str, str], headers: Dict[str, str]) -> Any:
+        offset, limit = int(params.get("offset", 0)), int(params["limit"])
+        items = [{"id": idx} for idx in range(offset, min(offset + limit, available))]
+        return 200, {}, {"items": items, "total": total}
+
+    return handler
+
+
+def page_api(first_page: int, pages: int, page_size: int = 5) -> Callable[..., Any]:
+    def handler(path: str, params: Dict[str, str], headers: Dict[str, str]) -> Any:
+        index = int(params.get("page", first_page)) - first_page
+        items = []
+        if 0 <= index < pages:
+            items = [{"id": index * page_size + idx} for idx in range(page_size)]
+        return 200, {}, {"items": items, "total": pages}
+
+    return handler
+
+
+def page_paginator(first_page: int, **kwargs: Any) -> PageNumberPaginator:
+    if HAS_BASE_PAGE:
+        return PageNumberPaginator(base_page=first_page, **kwargs)
+    return PageNumberPaginator(initial_page=first_page, **kwargs)
+
+
+def fetch(
+    fake_api: Any, make_paginator: Callable[[], BasePaginator], prefetch: int
+) -> List[List[Any]]:
+    client = RESTClient(base_url=fake_api.base_url)
+    pages = paginate_with_prefetch(
+        client,
+        prefetch,
+        path="items",
+        params={"limit": 10},
+        paginator=make_paginator(),
+        data_selector="items",
+    )
+    return [list(page) for page in pages]
+
+
+@pytest.mark.parametrize(
+    "available,total,maximum_offset",
+    [(95, 95, None), (100, 100, None), (95, 95, 40), (45, 100, None)],
+)
+def test_offset_pages_match(
+    fake_api: Any, available: int, total: int, maximum_offset: Optional[int]
+) -> None:
+    fake_api.handler = offset_api(available, total)
+
+    def make_paginator() -> BasePaginator:
+        return OffsetPaginator(limit=10, total_path="total", maximum_offset=maximum_offset)
+
+    assert fetch(fake_api, make_paginator, prefetch=3) == fetch(fake_api, make_paginator, prefetch=0)
+
+
+@pytest.mark.parametrize(
+    "first_page,pages,maximum_page",
+    [(0, 4, None), (1, 4, None), (1, 1, None), (1, 6, 4), (2, 5, None)],
+)
+def test_page_number_pages_match(
+    fake_api: Any, first_page: int, pages: int, maximum_page: Optional[int]
+) -> None:
+    fake_api.handler = page_api(first_page, pages)
+
+    def make_paginator() -> BasePaginator:
+        return page_paginator(first_page, total_path="total", maximum_page=maximum_page)
+
+    assert fetch(fake_api, make_paginator, prefetch=3) == fetch(fake_api, make_paginator, prefetch=0)
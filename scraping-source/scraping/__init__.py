@@ -25,10 +25,23 @@ def run_pipeline(  # type: ignore[valid-type]
     batch_size: t.Optional[int] = None,
     queue_size: t.Optional[int] = None,
     queue_result_timeout: t.Optional[float] = None,
+    batch_handoff: t.Optional[bool] = None,
+    max_batch_items: t.Optional[int] = None,
+    max_batch_bytes: t.Optional[int] = None,
+    max_batch_latency: t.Optional[float] = None,
+    backpressure: t.Optional[bool] = None,
+    workers: t.Optional[int] = None,
+    resumable: t.Optional[bool] = None,
+    arrow_batches: t.Optional[bool] = None,
+    route_items: t.Optional[bool] = None,
+    conditional_requests: t.Optional[bool] = None,
+    metrics: t.Optional[bool] = None,
     **kwargs: P.kwargs,
-) -> None:
+) -> t.Optional[AnyDict]:
     """Simple runner for the scraping pipeline
 
+    Returns summary of crawl and load metrics if `metrics` are enabled, it is also logged.
+
     You can pass all parameters via kwargs to `dlt.pipeline.run(....)`
 
         ```
@@ -57,12 +70,45 @@ def run_pipeline(  # type: ignore[valid-type]
     if queue_result_timeout:
         options["queue_result_timeout"] = queue_result_timeout
 
+    if batch_handoff is not None:
+        options["batch_handoff"] = batch_handoff
+
+    if max_batch_items:
+        options["max_batch_items"] = max_batch_items
+
+    if max_batch_bytes:
+        options["max_batch_bytes"] = max_batch_bytes
+
+    if max_batch_latency:
+        options["max_batch_latency"] = max_batch_latency
+
+    if backpressure is not None:
+        options["backpressure"] = backpressure
+
+    if workers:
+        options["workers"] = workers
+
+    if resumable is not None:
+        options["resumable"] = resumable
+
+    if arrow_batches is not None:
+        options["arrow_batches"] = arrow_batches
+
+    if route_items is not None:
+        options["route_items"] = route_items
+
+    if conditional_requests is not None:
+        options["conditional_requests"] = conditional_requests
+
+    if metrics is not None:
+        options["metrics"] = metrics
+
     scraping_host = create_pipeline_runner(pipeline, spider, **options)
 
     if on_before_start:
         on_before_start(scraping_host.pipeline_runner.scraping_resource)
 
-    scraping_host.run(*args, **kwargs)
+    return scraping_host.run(*args, **kwargs)
 
 
 # This way we allow dlt init to detect scraping source it is indeed hacky
@@ -0,0 +1,17 @@
+"""Arrow helpers, imported only when arrow batches are enabled"""
+import typing as t
+
+from dlt.common.libs.pyarrow import pyarrow as pa
+from itemadapter import ItemAdapter  # type: ignore
+
+
+def items_to_record_batch(
+    items: t.List[t.Any],
+    schema: t.Optional[pa.Schema] = None,
+) -> pa.RecordBatch:
+    """Converts batch of scraped items into arrow record batch
+
+    If `schema` is not given it is inferred from the items of the batch.
+    """
+    rows = [item if isinstance(item, dict) else ItemAdapter(item).asdict() for item in items]
+    return pa.RecordBatch.from_pylist(rows, schema=schema)
@@ -10,10 +10,32 @@ from dlt.common.configuration.specs.base_configuration import (
 
 from scrapy import Spider  # type: ignore
 
+from .metrics import ScrapingMetrics
+from .middlewares import (
+    HTTP_VALIDATORS_SETTING,
+    ConditionalRequestMiddleware,
+    HttpValidators,
+)
 from .queue import ScrapingQueue
-from .settings import SOURCE_SCRAPY_QUEUE_SIZE, SOURCE_SCRAPY_SETTINGS
-from .runner import ScrapingHost, PipelineRunner, ScrapyRunner, Signals
+from .settings import (
+    SOURCE_SCRAPY_CONDITIONAL_MIDDLEWARE_PRIORITY,
+    SOURCE_SCRAPY_JOBDIR,
+    SOURCE_SCRAPY_METRICS_LOG_INTERVAL,
+    SOURCE_SCRAPY_QUEUE_SIZE,
+    SOURCE_SCRAPY_RUNNING_JOBDIR,
+    SOURCE_SCRAPY_SETTINGS,
+    SOURCE_SCRAPY_START_URLS_DEDUP_CAPACITY,
+    SOURCE_SCRAPY_START_URLS_DEDUP_ERROR_RATE,
+)
+from .runner import (
+    ScrapingHost,
+    PipelineRunner,
+    ScrapyRunner,
+    ShardedScrapyRunner,
+    Signals,
+)
 from .types import AnyDict
+from .urls import StartUrls
 
 
 @configspec
@@ -27,10 +49,76 @@ class ScrapingConfig(BaseConfiguration):
     # result wait timeout for our queue
     queue_result_timeout: t.Optional[float] = 1.0
 
+    # hand over scraped items to the queue in chunks of `batch_size`
+    batch_handoff: t.Optional[bool] = False
+
+    # Flush policy for batches passed to dlt, a batch is flushed as soon as
+    # it has `max_batch_items` items (defaults to `batch_size`), reaches
+    # `max_batch_bytes` of estimated item size or its first item
+    # waits longer than `max_batch_latency` seconds.
+    max_batch_items: t.Optional[int] = None
+    max_batch_bytes: t.Optional[int] = None
+    max_batch_latency: t.Optional[float] = None
+
+    # pause crawling instead of blocking scrapy when the queue is full
+    # and resume once it drains to `backpressure_low_watermark` items
+    # which defaults to the half of `queue_size`.
+    backpressure: t.Optional[bool] = False
+    backpressure_low_watermark: t.Optional[int] = None
+
+    # Number of scrapy processes, start urls are sharded across them
+    workers: t.Optional[int] = 1
+
+    # keep crawling state in pipeline working dir so interrupted
+    # runs continue from where they stopped
+    resumable: t.Optional[bool] = False
+
+    # convert batches to arrow record batches, schema is taken from
+    # `item_schema` attribute of the spider or inferred from every batch
+    arrow_batches: t.Optional[bool] = False
+
+    # route items to tables by item class or `__table__` key of dict items
+    route_items: t.Optional[bool] = False
+
+    # collect crawl and load metrics, `run_pipeline` returns their summary
+    metrics: t.Optional[bool] = False
+
+    # how often (in seconds) crawl and load metrics are logged, 0 disables logging
+    metrics_log_interval: t.Optional[float] = SOURCE_SCRAPY_METRICS_LOG_INTERVAL
+
+    # send conditional requests using ETag, Last-Modified and content hash of pages
+    # from the previous run kept in dlt state and skip pages which did not change
+    conditional_requests: t.Optional[bool] = False
+
     # List of start urls
     start_urls: t.List[str] = None
     start_urls_file: str = None
 
+    # start urls are deduplicated with a bloom filter sized for
+    # `start_urls_dedup_capacity` urls with the given false positive rate
+    start_urls_dedup_capacity: t.Optional[int] = SOURCE_SCRAPY_START_URLS_DEDUP_CAPACITY
+    start_urls_dedup_error_rate: t.Optional[float] = SOURCE_SCRAPY_START_URLS_DEDUP_ERROR_RATE
+
+
+@with_config(sections=("sources", "scraping"), spec=ScrapingConfig)
+def create_start_urls(
+    start_urls: t.Optional[t.List[str]] = dlt.config.value,
+    start_urls_file: t.Optional[str] = dlt.config.value,
+    start_urls_dedup_capacity: int = dlt.config.value,
+    start_urls_dedup_error_rate: float = dlt.config.value,
+) -> StartUrls:
+    """Creates lazy start urls provider
+    If both `start_urls` and `start_urls_file` given, we will merge them,
+    file is read line by line while scrapy consumes start urls and
+    urls are deduplicated using bounded memory.
+    """
+    return StartUrls(
+        urls=start_urls,
+        urls_file=start_urls_file,
+        dedup_capacity=start_urls_dedup_capacity,
+        dedup_error_rate=start_urls_dedup_error_rate,
+    )
+
 
 @with_config(sections=("sources", "scraping"), spec=ScrapingConfig)
 def resolve_start_urls(
@@ -41,16 +129,7 @@ def resolve_start_urls(
     If both `start_urls` and `start_urls_file` given, we will merge them
     and return deduplicated list of `start_urls` for scrapy spider.
     """
-    urls = set()
-    if os.path.exists(start_urls_file):
-        with open(start_urls_file, encoding="utf-8") as fp:
-            urls = {line for line in fp.readlines() if str(line).strip()}
-
-    if start_urls:
-        for url in start_urls:
-            urls.add(url)
-
-    return list(set(urls))
+    return list(StartUrls(urls=start_urls, urls_file=start_urls_file))
 
 
 @with_config(sections=("sources", "scraping"), spec=ScrapingConfig)
@@ -60,44 +139,118 @@ def create_pipeline_runner(
     batch_size: int = dlt.config.value,
     queue_size: int = dlt.config.value,
     queue_result_timeout: float = dlt.config.value,
+    batch_handoff: bool = dlt.config.value,
+    max_batch_items: t.Optional[int] = dlt.config.value,
+    max_batch_bytes: t.Optional[int] = dlt.config.value,
+    max_batch_latency: t.Optional[float] = dlt.config.value,
+    backpressure: bool = dlt.config.value,
+    backpressure_low_watermark: t.Optional[int] = dlt.config.value,
+    workers: int = dlt.config.value,
+    resumable: bool = dlt.config.value,
+    arrow_batches: bool = dlt.config.value,
+    route_items: bool = dlt.config.value,
+    metrics: bool = dlt.config.value,
+    metrics_log_interval: t.Optional[float] = dlt.config.value,
+    conditional_requests: bool = dlt.config.value,
     scrapy_settings: t.Optional[AnyDict] = None,
 ) -> ScrapingHost:
     """Creates scraping host instance
     This helper only creates pipeline host, so running and controlling
     scrapy runner and pipeline is completely delegated to advanced users
     """
+    queue_options: AnyDict = {
+        "maxsize": queue_size,
+        "batch_size": batch_size,
+        "read_timeout": queue_result_timeout,
+        "batch_handoff": batch_handoff,
+        "max_batch_items": max_batch_items,
+        "max_batch_bytes": max_batch_bytes,
+        "max_batch_latency": max_batch_latency,
+    }
+    scraping_metrics = ScrapingMetrics() if metrics else None
+
+    # Scrapy workers pass batches as they are, only the queue
+    # consumed by the pipeline routes and converts them to arrow.
     queue = ScrapingQueue(  # type: ignore
-        maxsize=queue_size,
-        batch_size=batch_size,
-        read_timeout=queue_result_timeout,
+        **queue_options,
+        arrow_batches=arrow_batches,
+        arrow_schema=getattr(spider, "item_schema", None),
+        route_items=route_items,
+        metrics=scraping_metrics,
     )
 
-    signals = Signals(
-        pipeline_name=pipeline.pipeline_name,
-        queue=queue,
-    )
+    signals_options: AnyDict = {
+        "backpressure": backpressure,
+        "low_watermark": backpressure_low_watermark,
+    }
+
+    # Scrapy crawls in a copy of the crawling state, see `ScrapingHost`
+    jobdir = running_jobdir = None
+    if resumable:
+        jobdir = os.path.join(pipeline.working_dir, SOURCE_SCRAPY_JOBDIR)
+        running_jobdir = os.path.join(pipeline.working_dir, SOURCE_SCRAPY_RUNNING_JOBDIR)
 
     # Just to simple merge
     settings = {**SOURCE_SCRAPY_SETTINGS}
     if scrapy_settings:
         settings = {**scrapy_settings}
 
-    scrapy_runner = ScrapyRunner(
-        spider=spider,
-        start_urls=resolve_start_urls(),
-        signals=signals,
-        settings=settings,
-    )
+    validators = None
+    if conditional_requests:
+        validators = HttpValidators()
+        middleware = ".".join(
+            (ConditionalRequestMiddleware.__module__, ConditionalRequestMiddleware.__name__)
+        )
+        settings[HTTP_VALIDATORS_SETTING] = validators
+        settings["DOWNLOADER_MIDDLEWARES"] = {
+            **settings.get("DOWNLOADER_MIDDLEWARES", {}),
+            middleware: SOURCE_SCRAPY_CONDITIONAL_MIDDLEWARE_PRIORITY,
+        }
+
+    scrapy_runner: t.Union[ScrapyRunner, ShardedScrapyRunner]
+    if workers and workers > 1:
+        scrapy_runner = ShardedScrapyRunner(
+            spider=spider,
+            start_urls=create_start_urls(),
+            settings=settings,
+            queue=queue,
+            workers=workers,
+            pipeline_name=pipeline.pipeline_name,
+            queue_options=queue_options,
+            signals_options=signals_options,
+            jobdir=running_jobdir,
+            metrics=scraping_metrics,
+        )
+    else:
+        signals = Signals(
+            pipeline_name=pipeline.pipeline_name,
+            queue=queue,
+            metrics=scraping_metrics,
+            **signals_options,
+        )
+
+        scrapy_runner = ScrapyRunner(
+            spider=spider,
+            start_urls=create_start_urls(),
+            signals=signals,
+            settings=settings,
+            jobdir=running_jobdir,
+        )
 
     pipeline_runner = PipelineRunner(
         pipeline=pipeline,
         queue=queue,
+        metrics=scraping_metrics,
+        validators=validators,
     )
 
     scraping_host = ScrapingHost(
         queue,
         scrapy_runner,
         pipeline_runner,
+        jobdir=jobdir,
+        metrics=scraping_metrics,
+        metrics_log_interval=metrics_log_interval,
     )
 
     return scraping_host
@@ -0,0 +1,108 @@
+"""Crawl and load throughput instrumentation"""
+import math
+import time
+import typing as t
+
+from .types import AnyDict
+
+
+class Histogram:
+    """Keeps count, sum, min, max and power of two buckets of observed values
+
+    Every histogram is updated by a single thread so it does not lock.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min: t.Optional[float] = None
+        self.max: t.Optional[float] = None
+        self.buckets: t.Dict[float, int] = {}
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+        # Upper bound of the bucket, 0 is kept for zeros
+        bound = 2.0 ** math.ceil(math.log2(value)) if value > 0 else 0.0
+        self.buckets[bound] = self.buckets.get(bound, 0) + 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> AnyDict:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "min": self.min,
+            "max": self.max,
+            "mean": round(self.mean, 6),
+            "buckets": dict(sorted(self.buckets.items())),
+        }
+
+
+class ScrapingMetrics:
+    """Counters and histograms of the scraping host
+
+    * `put_blocked` — seconds the scrapy side was blocked handing over items,
+    * `get_wait` — seconds the dlt side waited for new items,
+    * `batch_sizes` — sizes of batches passed to dlt,
+    * `queue_depth` — sampled number of items waiting in the queue,
+    * `pipeline_steps` — durations of extract, normalize and load steps.
+
+    If scrapy is mostly blocked (or paused) we are load-bound,
+    if dlt mostly waits for items we are crawl-bound.
+    """
+
+    def __init__(self) -> None:
+        self.started_at = time.monotonic()
+        self.items_scraped = 0
+        self.items_loaded = 0
+        self.put_blocked = Histogram()
+        self.get_wait = Histogram()
+        self.batch_sizes = Histogram()
+        self.queue_depth = Histogram()
+        self.pause_count = 0
+        self.paused_seconds = 0.0
+        self.pipeline_steps: t.Dict[str, float] = {}
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def bottleneck(self) -> str:
+        if self.put_blocked.total + self.paused_seconds > self.get_wait.total:
+            return "load"
+        return "crawl"
+
+    def log_line(self, queue_depth: int) -> str:
+        elapsed = max(self.elapsed, 1e-9)
+        return (
+            f"Scraping: {self.items_scraped} items scraped "
+            f"({self.items_scraped / elapsed:.1f} items/sec), "
+            f"{self.items_loaded} items passed to dlt in {self.batch_sizes.count} batches "
+            f"(mean batch {self.batch_sizes.mean:.1f}), queue depth {queue_depth}, "
+            f"scrapy blocked {self.put_blocked.total:.2f}s, paused {self.paused_seconds:.2f}s, "
+            f"dlt waited {self.get_wait.total:.2f}s"
+        )
+
+    def summary(self) -> AnyDict:
+        elapsed = max(self.elapsed, 1e-9)
+        return {
+            "elapsed": round(elapsed, 3),
+            "items_scraped": self.items_scraped,
+            "items_loaded": self.items_loaded,
+            "items_per_second": round(self.items_scraped / elapsed, 3),
+            "put_blocked_seconds": self.put_blocked.summary(),
+            "get_wait_seconds": self.get_wait.summary(),
+            "batch_sizes": self.batch_sizes.summary(),
+            "queue_depth": self.queue_depth.summary(),
+            "pause_count": self.pause_count,
+            "paused_seconds": round(self.paused_seconds, 3),
+            "pipeline_steps_seconds": dict(self.pipeline_steps),
+            "bottleneck": self.bottleneck,
+        }
@@ -0,0 +1,168 @@
+"""Scrapy middlewares used by the scraping source"""
+import hashlib
+import threading
+import typing as t
+
+from scrapy import Request, Spider  # type: ignore
+from scrapy.crawler import Crawler  # type: ignore
+from scrapy.exceptions import IgnoreRequest, NotConfigured  # type: ignore
+from scrapy.http import Response  # type: ignore
+
+from .types import AnyDict
+
+# Scrapy setting which holds `HttpValidators` instance
+HTTP_VALIDATORS_SETTING = "DLT_HTTP_VALIDATORS"
+
+
+class HttpValidators:
+    """Per url `ETag`, `Last-Modified` and content hash
+
+    `previous` are validators from the last run, `downloaded` are collected
+    during this run. Validators of a page are persisted only once all items
+    scraped from it reached the pipeline, so pages whose items were not loaded
+    (i.e. crawl stopped by `add_limit`) are downloaded again on the next run.
+
+    Pages are downloaded and items scraped in the reactor thread while the
+    pipeline thread takes items, so every access takes the lock.
+    Instance is shared with the crawler, so it is never deep copied
+    when scrapy copies its settings. Scrapy workers get a pickled copy
+    with a lock of their own.
+    """
+
+    def __init__(self, previous: t.Optional[t.Dict[str, AnyDict]] = None) -> None:
+        self.previous: t.Dict[str, AnyDict] = previous or {}
+        self.downloaded: t.Dict[str, AnyDict] = {}
+        # Page urls of scraped items (by item id) which did not reach the pipeline yet
+        self.pending_items: t.Dict[int, str] = {}
+        self.pending_pages: t.Dict[str, int] = {}
+        self.delivered_pages: t.Set[str] = set()
+        self.lock = threading.Lock()
+
+    def load(self, previous: t.Dict[str, AnyDict]) -> None:
+        self.previous = dict(previous)
+
+    def page_downloaded(self, url: str, validators: AnyDict) -> None:
+        with self.lock:
+            self.downloaded[url] = validators
+
+    def update(self, downloaded: t.Dict[str, AnyDict]) -> None:
+        """Adds validators of pages downloaded by a scrapy worker"""
+        with self.lock:
+            self.downloaded.update(downloaded)
+
+    def items_scraped(self, items: t.Sequence[t.Any], urls: t.Sequence[t.Optional[str]]) -> None:
+        """Remembers page urls of items handed over to the queue"""
+        with self.lock:
+            for item, url in zip(items, urls):
+                if url:
+                    self.pending_items[id(item)] = url
+                    self.pending_pages[url] = self.pending_pages.get(url, 0) + 1
+
+    def release(self, items: t.Sequence[t.Any]) -> t.List[t.Optional[str]]:
+        """Forgets items which left this process' queue, returns their page urls"""
+        urls = []
+        with self.lock:
+            for item in items:
+                url = self.pending_items.pop(id(item), None)
+                if url:
+                    self.pending_pages[url] -= 1
+                    if not self.pending_pages[url]:
+                        del self.pending_pages[url]
+                urls.append(url)
+        return urls
+
+    def delivered(self, items: t.Sequence[t.Any]) -> None:
+        """Marks pages of items taken by the pipeline"""
+        urls = self.release(items)
+        with self.lock:
+            self.delivered_pages.update(url for url in urls if url)
+
+    def snapshot(self, finished: bool) -> t.Dict[str, AnyDict]:
+        """Validators to persist, urls not visited in this run are kept
+
+        Take it once crawling stopped. Downloaded pages are kept if none of their items
+        is pending and some of them were delivered, pages without items only if
+        crawling `finished`, otherwise the spider could be interrupted while parsing them.
+        """
+        with self.lock:
+            confirmed = {
+                url: validators
+                for url, validators in self.downloaded.items()
+                if url not in self.pending_pages and (finished or url in self.delivered_pages)
+            }
+        return {**self.previous, **confirmed}
+
+    def __deepcopy__(self, memo: AnyDict) -> "HttpValidators":
+        return self
+
+    def __getstate__(self) -> AnyDict:
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: AnyDict) -> None:
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+
+class ConditionalRequestMiddleware:
+    """Skips pages which did not change since the last run
+
+    Requests are sent with `If-None-Match` and `If-Modified-Since` headers
+    if we know validators of the url. Pages answered with `304 Not Modified`
+    and pages with unchanged content hash are dropped, so spider does not emit items for them.
+    """
+
+    def __init__(self, validators: HttpValidators) -> None:
+        self.validators = validators
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> "ConditionalRequestMiddleware":
+        validators = crawler.settings.get(HTTP_VALIDATORS_SETTING)
+        if not validators:
+            raise NotConfigured
+        return cls(validators)
+
+    def process_request(self, request: Request, spider: Spider) -> None:
+        if request.method != "GET":
+            return None
+
+        known = self.validators.previous.get(request.url)
+        if known:
+            if known.get("etag"):
+                request.headers.setdefault("If-None-Match", known["etag"])
+            if known.get("last_modified"):
+                request.headers.setdefault("If-Modified-Since", known["last_modified"])
+        return None
+
+    def process_response(self, request: Request, response: Response, spider: Spider) -> Response:
+        if request.method != "GET":
+            return response
+
+        known = self.validators.previous.get(request.url)
+        if response.status == 304 and known:
+            # previous validators are kept
+            raise IgnoreRequest(f"Not modified: {request.url}")
+
+        if response.status != 200:
+            return response
+
+        content_hash = hashlib.sha256(response.body).hexdigest()
+        self.validators.page_downloaded(
+            request.url,
+            {
+                "etag": self._header(response, b"ETag"),
+                "last_modified": self._header(response, b"Last-Modified"),
+                "hash": content_hash,
+            },
+        )
+
+        if known and known.get("hash") == content_hash:
+            raise IgnoreRequest(f"Content not changed: {request.url}")
+
+        return response
+
+    @staticmethod
+    def _header(response: Response, name: bytes) -> t.Optional[str]:
+        value = response.headers.get(name)
+        return value.decode("latin-1") if value else None
@@ -1,8 +1,12 @@
+import time
 import typing as t
-from queue import Empty, Queue
+from queue import Empty, Full, Queue
 
+import dlt
 from dlt.common import logger
 
+from .metrics import ScrapingMetrics
+
 
 # Please read more at https://mypy.readthedocs.io/en/stable/runtime_troubles.html#not-generic-runtime
 T = t.TypeVar("T")
@@ -18,47 +22,211 @@ else:
         pass
 
 
+# Dict items are routed to the table given under this key
+TABLE_NAME_KEY = "__table__"
+
+
 class QueueClosedError(Exception):
     pass
 
 
+def group_items_by_table(items: t.List[t.Any]) -> t.Dict[t.Optional[str], t.List[t.Any]]:
+    """Groups items by destination table keeping the order of items
+
+    Dict items go to the table under `__table__` key (the key is removed),
+    other items (like `scrapy.Item`) go to the table named after their class,
+    items without a table are grouped under `None`.
+    """
+    groups: t.Dict[t.Optional[str], t.List[t.Any]] = {}
+    for item in items:
+        if isinstance(item, dict):
+            table_name = item.pop(TABLE_NAME_KEY, None)
+        else:
+            table_name = type(item).__name__
+        groups.setdefault(table_name, []).append(item)
+    return groups
+
+
+def estimate_item_size(item: t.Any) -> int:
+    """Cheap estimate of the serialized size of scraped item in bytes"""
+    if isinstance(item, str):
+        return len(item)
+    if isinstance(item, bytes):
+        return len(item)
+    if isinstance(item, t.Mapping):
+        return sum(len(str(key)) + estimate_item_size(value) for key, value in item.items())
+    if isinstance(item, (list, tuple, set)):
+        return sum(estimate_item_size(value) for value in item)
+    return 8
+
+
 class ScrapingQueue(_Queue[T]):
     def __init__(
         self,
         maxsize: int = 0,
         batch_size: int = 10,
         read_timeout: float = 1.0,
+        batch_handoff: bool = False,
+        max_batch_items: t.Optional[int] = None,
+        max_batch_bytes: t.Optional[int] = None,
+        max_batch_latency: t.Optional[float] = None,
+        arrow_batches: bool = False,
+        arrow_schema: t.Optional[t.Any] = None,
+        route_items: bool = False,
+        metrics: t.Optional[ScrapingMetrics] = None,
     ) -> None:
         super().__init__(maxsize)
         self.batch_size = batch_size
         self.read_timeout = read_timeout
+        self.batch_handoff = batch_handoff
+
+        # Flush policy for batches we pass to dlt
+        self.max_batch_items = max_batch_items or batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_latency = max_batch_latency
+
+        # Batches are converted to `pyarrow.RecordBatch` when streamed
+        self.arrow_batches = arrow_batches
+        self.arrow_schema = arrow_schema
+
+        # Items are routed to tables by their class or `__table__` key
+        self.route_items = route_items
+        self.metrics = metrics
         self._is_closed = False
+        # Set once the queue is closed and all its items were handed to dlt
+        self._is_exhausted = False
+
+        # Producer side buffer, it is only touched by the thread
+        # which scrapes items so it does not need any locking.
+        self._buffer: t.List[T] = []
+
+    def put_buffered(self, item: T) -> None:
+        """Buffers item on the producer side
+
+        Buffered items are handed over to the queue in chunks of `batch_size`
+        so the producer takes the queue lock once per chunk instead of once per item.
+        Call `flush` to hand over what is left in the buffer.
+        """
+        self._buffer.append(item)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def offer(self, item: T) -> bool:
+        """Buffers item and tries to hand over the buffer without blocking
+
+        Returns:
+            bool: False if the queue is full and items were kept in the buffer
+        """
+        self._buffer.append(item)
+        if len(self._buffer) >= (self.batch_size if self.batch_handoff else 1):
+            return self.flush(block=False)
+        return True
+
+    def flush(self, block: bool = True) -> bool:
+        """Hands over buffered items to the consumer
+
+        Returns:
+            bool: False if the queue is full and items were kept in the buffer,
+                it can only happen if `block` is False.
+        """
+        if self._buffer:
+            try:
+                self.put_many(self._buffer, block=block)
+            except Full:
+                return False
+            self._buffer = []
+        return True
+
+    def put_many(
+        self,
+        items: t.List[T],
+        block: bool = True,
+        timeout: t.Optional[float] = None,
+    ) -> None:
+        """Puts all items with a single lock round-trip
+
+        If the queue is bounded we wait until there is a free slot and then
+        append the whole chunk, so the queue can overshoot `maxsize` by at most one chunk.
+
+        Raises:
+            Full: if there was no free slot within `timeout` or right away if `block` is False
+        """
+        if not items:
+            return
+
+        with self.not_full:
+            if self.maxsize > 0:
+                deadline = None if timeout is None else time.monotonic() + timeout
+                while self._qsize() >= self.maxsize:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if not block or (remaining is not None and remaining <= 0):
+                        raise Full
+                    self.not_full.wait(remaining)
+
+            self.queue.extend(items)
+            self.unfinished_tasks += len(items)
+            self.not_empty.notify()
+
+    def get_many(self, max_items: int, timeout: t.Optional[float] = None) -> t.List[T]:
+        """Takes up to `max_items` with a single lock round-trip
+
+        Items are marked as done right away, same as `get_batches` does
+        for every single item in the regular mode.
+
+        Raises:
+            Empty: if no items arrived within `timeout`
+        """
+        with self.not_empty:
+            if not self._qsize():
+                self.not_empty.wait(timeout)
+                if not self._qsize():
+                    raise Empty
+
+            count = min(max_items, self._qsize())
+            items = [self.queue.popleft() for _ in range(count)]
+
+            self.unfinished_tasks -= count
+            if self.unfinished_tasks <= 0:
+                self.all_tasks_done.notify_all()
+
+            self.not_full.notify_all()
+            return items
 
     def get_batches(self) -> t.Iterator[t.Any]:
         """Batching helper can be wrapped as a dlt.resource
 
+        Batch is flushed once any of the limits is reached
+
+            * `max_batch_items` items were collected,
+            * `max_batch_bytes` estimated bytes were collected,
+            * `max_batch_latency` seconds passed since the first item of the batch arrived,
+            * no new items arrived within `read_timeout`.
+
+        Once the queue is closed whatever is left in it is drained
+        so producers waiting on `join` are released.
+
         Returns:
-            Iterator[Any]: yields scraped items one by one
+            Iterator[Any]: yields batches of scraped items
         """
         batch: t.List[T] = []
+        batch_bytes = 0
+        flush_at: t.Optional[float] = None
         while True:
-            if len(batch) == self.batch_size:
-                yield batch
-                batch = []
-
             try:
-                if self.is_closed:
+                # Closed queue is drained first
+                if self.is_closed and not self._qsize():
                     raise QueueClosedError("Queue is closed")
 
-                item = self.get(timeout=self.read_timeout)
-                batch.append(item)
+                timeout = 0.0 if self.is_closed else self.read_timeout
+                if flush_at is not None:
+                    timeout = max(0.0, min(timeout, flush_at - time.monotonic()))
 
-                # Mark task as completed
-                self.task_done()
+                items = self._take(self.max_batch_items - len(batch), timeout)
             except Empty:
                 if batch:
                     yield batch
-                    batch = []
+                    batch, batch_bytes, flush_at = [], 0, None
+                continue
             except QueueClosedError:
                 logger.info("Queue is closed, stopping...")
 
@@ -68,22 +236,119 @@ class ScrapingQueue(_Queue[T]):
 
                 break
 
-    def stream(self) -> t.Iterator[t.Any]:
+            if not batch and self.max_batch_latency is not None:
+                flush_at = time.monotonic() + self.max_batch_latency
+
+            batch.extend(items)
+            if self.max_batch_bytes is not None:
+                batch_bytes += sum(estimate_item_size(item) for item in items)
+
+            if (
+                len(batch) >= self.max_batch_items
+                or (self.max_batch_bytes is not None and batch_bytes >= self.max_batch_bytes)
+                or (flush_at is not None and time.monotonic() >= flush_at)
+            ):
+                yield batch
+                batch, batch_bytes, flush_at = [], 0, None
+
+    def _take(self, max_items: int, timeout: float) -> t.List[T]:
+        """Takes items either chunk-wise or one by one depending on handoff mode"""
+        started_at = time.perf_counter() if self.metrics else 0.0
+        try:
+            if self.batch_handoff:
+                return self.get_many(max_items, timeout=timeout)
+
+            item = self.get(timeout=timeout)
+
+            # Mark task as completed
+            self.task_done()
+            return [item]
+        finally:
+            if self.metrics:
+                self.metrics.get_wait.observe(time.perf_counter() - started_at)
+
+    def stream(
+        self, on_delivered: t.Optional[t.Callable[[t.List[T]], None]] = None
+    ) -> t.Iterator[t.Any]:
         """Streaming generator, wraps get_batches
         and handles `GeneratorExit` if dlt closes it.
 
+        If `arrow_batches` is enabled every batch is converted
+        to `pyarrow.RecordBatch` so dlt takes its arrow path.
+        If `route_items` is enabled every batch is split by destination
+        table and each part is marked with its table name.
+        `on_delivered` is called with scraped items as they are handed to dlt.
+        Queue is exhausted once it is closed and dlt took all of its items.
+
         Returns:
             t.Iterator[t.Any]: returns batches of scraped content
         """
         try:
-            yield from self.get_batches()
+            for batch in self.get_batches():
+                if self.metrics:
+                    self.metrics.batch_sizes.observe(len(batch))
+                    self.metrics.items_loaded += len(batch)
+
+                if not self.route_items:
+                    converted = self._convert(batch, None)
+                    if on_delivered:
+                        on_delivered(batch)
+                    yield converted
+                    continue
+
+                for table_name, items in group_items_by_table(batch).items():
+                    converted = self._convert(items, table_name)
+                    if table_name:
+                        converted = dlt.mark.with_table_name(converted, table_name)
+                    if on_delivered:
+                        on_delivered(items)
+                    yield converted
+
+            self._is_exhausted = True
         except GeneratorExit:
             self.close()
 
+    def _convert(self, items: t.List[T], table_name: t.Optional[str]) -> t.Any:
+        """Converts items to arrow record batch if enabled
+
+        `arrow_schema` is either a single schema or a dict of schemas per table.
+        """
+        if not self.arrow_batches:
+            return items
+
+        # pyarrow is an optional dependency
+        from .arrow import items_to_record_batch
+
+        schema = self.arrow_schema
+        if isinstance(schema, dict):
+            schema = schema.get(table_name)
+        return items_to_record_batch(items, schema)
+
     def close(self) -> None:
         """Marks queue as closed"""
         self._is_closed = True
 
+    def drain(self) -> int:
+        """Drops items nobody is going to take anymore
+
+        Releases producers waiting on `join` or for a free slot once the consumer is gone.
+
+        Returns:
+            int: number of dropped items
+        """
+        with self.mutex:
+            count = self._qsize()
+            self.queue.clear()
+            self.unfinished_tasks = max(self.unfinished_tasks - count, 0)
+            if not self.unfinished_tasks:
+                self.all_tasks_done.notify_all()
+            self.not_full.notify_all()
+        return count
+
     @property
     def is_closed(self) -> bool:
         return self._is_closed
+
+    @property
+    def is_exhausted(self) -> bool:
+        return self._is_exhausted
@@ -1,17 +1,35 @@
 """This module contains abstractions to facilitate scraping and loading process"""
+import multiprocessing
+import os
+import shutil
+import sys
 import threading
+import time
 import typing as t
+from queue import Empty, Full
+
 import dlt
 
 from dlt.common import logger
 from pydispatch import dispatcher  # type: ignore
 from typing_extensions import Self
 
-from scrapy import signals, Item, Spider  # type: ignore
+from scrapy import signals, Item, Request, Spider  # type: ignore
 from scrapy.crawler import CrawlerProcess  # type: ignore
+from scrapy.http import Response  # type: ignore
+from twisted.internet import task  # type: ignore
 
 from .types import AnyDict, Runnable, P
+from .metrics import ScrapingMetrics
+from .middlewares import HTTP_VALIDATORS_SETTING, HttpValidators
 from .queue import ScrapingQueue
+from .urls import StartUrls
+from .settings import (
+    SOURCE_SCRAPY_BACKPRESSURE_INTERVAL,
+    SOURCE_SCRAPY_HTTP_VALIDATORS_STATE_KEY,
+    SOURCE_SCRAPY_METRICS_SAMPLE_INTERVAL,
+    SOURCE_SCRAPY_WORKER_CHANNEL_SIZE,
+)
 
 T = t.TypeVar("T")
 
@@ -21,16 +39,53 @@ class Signals:
 
     This wrapper is also a callable which accepts `CrawlerProcess` instance
     this is required to stop the scraping process as soon as the queue closes.
+
+    With `backpressure` enabled a full queue never blocks the reactor thread,
+    instead crawling engine is paused until the queue drains to `low_watermark`.
     """
 
-    def __init__(self, pipeline_name: str, queue: ScrapingQueue[T]) -> None:
+    def __init__(
+        self,
+        pipeline_name: str,
+        queue: ScrapingQueue[T],
+        backpressure: bool = False,
+        low_watermark: t.Optional[int] = None,
+        metrics: t.Optional[ScrapingMetrics] = None,
+    ) -> None:
         self.stopping = False
         self.queue = queue
         self.pipeline_name = pipeline_name
+        self.metrics = metrics
+        self.validators: t.Optional[HttpValidators] = None
+        self.flush_loop: t.Optional[task.LoopingCall] = None
 
-    def on_item_scraped(self, item: Item) -> None:
+        self.backpressure = backpressure
+        self.low_watermark = (
+            low_watermark if low_watermark is not None else queue.maxsize // 2
+        )
+        self.backpressure_loop: t.Optional[task.LoopingCall] = None
+        self.close_reason: t.Optional[str] = None
+        self.paused_at: t.Optional[float] = None
+        self.pause_count = 0
+        self.paused_seconds = 0.0
+
+    def on_item_scraped(self, item: Item, response: t.Optional[Response] = None) -> None:
         if not self.queue.is_closed:
-            self.queue.put(item)
+            started_at = time.perf_counter() if self.metrics else 0.0
+            if self.validators and response is not None:
+                self.validators.items_scraped([item], [response.url])
+
+            if self.backpressure:
+                if not self.queue.offer(item):
+                    self.pause_crawling()
+            elif self.queue.batch_handoff:
+                self.queue.put_buffered(item)
+            else:
+                self.queue.put(item)
+
+            if self.metrics:
+                self.metrics.items_scraped += 1
+                self.metrics.put_blocked.observe(time.perf_counter() - started_at)
         else:
             logger.info(
                 "Queue is closed, stopping",
@@ -39,15 +94,66 @@ class Signals:
             if not self.stopping:
                 self.on_engine_stopped()
 
+    def on_spider_closed(self, reason: str) -> None:
+        self.close_reason = reason
+
     def on_engine_stopped(self) -> None:
         logger.info(f"Crawling engine stopped for pipeline={self.pipeline_name}")
         self.stopping = True
+        self.resume_crawling()
+        if self.pause_count:
+            logger.info(
+                f"Crawling was paused {self.pause_count} times for "
+                f"{self.paused_seconds:.2f}s in total, pipeline={self.pipeline_name}"
+            )
+
+        if self.metrics:
+            self.metrics.pause_count = self.pause_count
+            self.metrics.paused_seconds = self.paused_seconds
+
         self.crawler.stop()
+        self.queue.flush()
         self.queue.close()
         self.queue.join()
 
+    def pause_crawling(self) -> None:
+        """Pauses crawling engines so no new requests are scheduled"""
+        if self.paused_at is not None:
+            return
+
+        logger.debug(f"Queue is full, pausing crawling for pipeline={self.pipeline_name}")
+        self.paused_at = time.monotonic()
+        self.pause_count += 1
+        for crawler in self.crawler.crawlers:
+            if crawler.engine:
+                crawler.engine.pause()
+
+    def resume_crawling(self) -> None:
+        """Resumes paused crawling engines"""
+        if self.paused_at is None:
+            return
+
+        logger.debug(f"Resuming crawling for pipeline={self.pipeline_name}")
+        self.paused_seconds += time.monotonic() - self.paused_at
+        self.paused_at = None
+        for crawler in self.crawler.crawlers:
+            if crawler.engine:
+                crawler.engine.unpause()
+
+    def check_backpressure(self) -> None:
+        """Resumes crawling once the queue drains to the low watermark"""
+        if self.paused_at is None:
+            # Hand over leftovers without blocking the reactor
+            if not self.queue.flush(block=False):
+                self.pause_crawling()
+            return
+
+        if self.queue.qsize() <= self.low_watermark and self.queue.flush(block=False):
+            self.resume_crawling()
+
     def __call__(self, crawler: CrawlerProcess) -> Self:
         self.crawler = crawler
+        self.validators = crawler.settings.get(HTTP_VALIDATORS_SETTING)
         return self
 
     def __enter__(self) -> None:
@@ -58,26 +164,83 @@ class Signals:
         # Once crawling engine stops we would like to know about it as well.
         dispatcher.connect(self.on_engine_stopped, signals.engine_stopped)
 
+        # Close reason tells if crawling was finished or interrupted.
+        dispatcher.connect(self.on_spider_closed, signals.spider_closed)
+
+        # Buffered items are handed over periodically so a slow
+        # crawl does not keep them in the buffer for too long.
+        if self.backpressure:
+            self.backpressure_loop = task.LoopingCall(self.check_backpressure)
+            self.backpressure_loop.start(SOURCE_SCRAPY_BACKPRESSURE_INTERVAL, now=False)
+        elif self.queue.batch_handoff:
+            self.flush_loop = task.LoopingCall(self.queue.flush)
+            self.flush_loop.start(self.queue.read_timeout, now=False)
+
     def __exit__(self, exc_type: t.Any, exc_val: t.Any, exc_tb: t.Any) -> None:
+        for loop in (self.flush_loop, self.backpressure_loop):
+            if loop and loop.running:
+                loop.stop()
+
         dispatcher.disconnect(self.on_item_scraped, signals.item_scraped)
         dispatcher.disconnect(self.on_engine_stopped, signals.engine_stopped)
+        dispatcher.disconnect(self.on_spider_closed, signals.spider_closed)
+
+
+def resumable_spider(spider: t.Type[Spider]) -> t.Type[Spider]:
+    """Makes start requests go through the dupe filter
+
+    Scrapy does not filter start requests so resumed crawl would
+    download all of them again, spiders with custom `start` or `start_requests`
+    are kept as is. Scrapy 2.13+ takes start requests from async `start`,
+    older versions from `start_requests`, which newer ones do not define.
+    """
+    for method in ("start", "start_requests"):
+        if getattr(spider, method, None) is not getattr(Spider, method, None):
+            return spider
+
+    def start_requests(self: Spider) -> t.Iterator[Request]:
+        for url in self.start_urls:
+            yield Request(url, dont_filter=False)
+
+    async def start(self: Spider) -> t.AsyncIterator[Request]:
+        for request in start_requests(self):
+            yield request
+
+    return type(
+        spider.__name__, (spider,), {"start": start, "start_requests": start_requests}
+    )
 
 
 class ScrapyRunner(Runnable):
-    """Scrapy runner handles setup and teardown of scrapy crawling"""
+    """Scrapy runner handles setup and teardown of scrapy crawling
+
+    If `jobdir` is given crawling state (seen requests and pending requests)
+    is persisted there, so interrupted crawl continues where it stopped.
+    """
 
     def __init__(
         self,
         spider: t.Type[Spider],
-        start_urls: t.List[str],
+        start_urls: t.Iterable[str],
         settings: AnyDict,
         signals: Signals,
+        jobdir: t.Optional[str] = None,
     ) -> None:
         self.spider = spider
         self.start_urls = start_urls
+        self.jobdir = jobdir
+        if jobdir:
+            settings = {**settings, "JOBDIR": jobdir}
+            self.spider = resumable_spider(spider)
+
         self.crawler = CrawlerProcess(settings=settings)
         self.signals = signals
 
+    @property
+    def finished(self) -> bool:
+        """Tells if crawling was finished and not interrupted"""
+        return self.signals.close_reason == "finished"
+
     def run(self, *args: P.args, **kwargs: P.kwargs) -> None:
         """Runs scrapy crawler process
 
@@ -103,15 +266,244 @@ class ScrapyRunner(Runnable):
             logger.info("Scraping stopped")
 
 
+def run_scrapy_worker(
+    worker_id: int,
+    spider: t.Type[Spider],
+    start_urls: t.Iterable[str],
+    settings: AnyDict,
+    pipeline_name: str,
+    queue_options: AnyDict,
+    signals_options: AnyDict,
+    channel: "multiprocessing.Queue[t.Tuple[int, str, t.Any]]",
+    kwargs: AnyDict,
+    jobdir: t.Optional[str] = None,
+) -> None:
+    """Entry point of a scrapy worker process
+
+    Worker runs regular scrapy runner with its own queue and forwards
+    messages via `channel` to the parent process
+
+        * `(worker_id, "items", (batch, urls))` for every batch of scraped items,
+          `urls` are page urls of the items in conditional requests mode,
+        * `(worker_id, "validators", validators)` with http validators
+          of downloaded pages in conditional requests mode,
+        * `(worker_id, "done", None)` once crawling is done.
+
+    Worker exits with non zero code if crawling was interrupted.
+    """
+    queue: ScrapingQueue[t.Any] = ScrapingQueue(**queue_options)
+    signals = Signals(pipeline_name=pipeline_name, queue=queue, **signals_options)
+    scrapy_runner = ScrapyRunner(
+        spider=spider,
+        start_urls=start_urls,
+        settings=settings,
+        signals=signals,
+        jobdir=jobdir,
+    )
+
+    validators: t.Optional[HttpValidators] = settings.get(HTTP_VALIDATORS_SETTING)
+
+    def forward() -> None:
+        for batch in queue.stream():
+            # Parent process tracks which pages of items reached the pipeline
+            urls = validators.release(batch) if validators else None
+            channel.put((worker_id, "items", (batch, urls)))
+
+    forwarder = threading.Thread(target=forward, name=f"scrapy_worker_{worker_id}_forwarder")
+    forwarder.start()
+    try:
+        scrapy_runner.run(**kwargs)
+    finally:
+        queue.close()
+        forwarder.join()
+
+        if validators:
+            # Items of pending pages were not forwarded to the parent
+            downloaded = {
+                url: page_validators
+                for url, page_validators in validators.downloaded.items()
+                if url not in validators.pending_pages
+            }
+            channel.put((worker_id, "validators", downloaded))
+
+        channel.put((worker_id, "done", None))
+
+    if not scrapy_runner.finished:
+        sys.exit(1)
+
+
+class ShardedScrapyRunner(Runnable):
+    """Runs scrapy in several worker processes
+
+    Start urls are sharded across `workers` processes by url hash
+    and scraped items from all of them are put into the single queue
+    which is consumed by the pipeline runner, so dlt still sees one resource.
+
+    Spider class must be importable by worker processes, so if it is defined
+    in your script make sure the pipeline is started under `if __name__ == "__main__":`.
+    """
+
+    def __init__(
+        self,
+        spider: t.Type[Spider],
+        start_urls: t.Iterable[str],
+        settings: AnyDict,
+        queue: ScrapingQueue[T],
+        workers: int,
+        pipeline_name: str,
+        queue_options: t.Optional[AnyDict] = None,
+        signals_options: t.Optional[AnyDict] = None,
+        jobdir: t.Optional[str] = None,
+        metrics: t.Optional[ScrapingMetrics] = None,
+    ) -> None:
+        self.spider = spider
+        self.start_urls = start_urls
+        self.jobdir = jobdir
+        self.metrics = metrics
+        self.finished = False
+        self.settings = settings
+        self.queue = queue
+        self.workers = workers
+        self.pipeline_name = pipeline_name
+        self.queue_options = queue_options or {}
+        self.signals_options = signals_options or {}
+
+    def shard_start_urls(self) -> t.List[StartUrls]:
+        """Splits start urls into shards by stable url hash"""
+        start_urls = self.start_urls
+        if not isinstance(start_urls, StartUrls):
+            start_urls = StartUrls(urls=list(start_urls))
+
+        return [start_urls.shard(worker_id, self.workers) for worker_id in range(self.workers)]
+
+    def run(self, *args: P.args, **kwargs: P.kwargs) -> None:
+        """Starts worker processes and forwards scraped items into the queue
+
+        All `kwargs` are forwarded to `crawler.crawl(**kwargs)` in every worker.
+        """
+        # Fresh interpreter for every worker, forking a process
+        # which already has twisted reactor installed is not safe.
+        context = multiprocessing.get_context("spawn")
+        shards = self.shard_start_urls()
+        channel = context.Queue(maxsize=len(shards) * SOURCE_SCRAPY_WORKER_CHANNEL_SIZE)
+        processes = [
+            context.Process(
+                target=run_scrapy_worker,
+                name=f"scrapy_worker_{worker_id}",
+                args=(
+                    worker_id,
+                    self.spider,
+                    shard,
+                    self.settings,
+                    self.pipeline_name,
+                    self.queue_options,
+                    self.signals_options,
+                    channel,
+                    kwargs,
+                    self.worker_jobdir(worker_id),
+                ),
+            )
+            for worker_id, shard in enumerate(shards)
+        ]
+
+        logger.info(f"Starting {len(processes)} scrapy workers")
+        for process in processes:
+            process.start()
+
+        running = set(range(len(processes)))
+        validators: t.Optional[HttpValidators] = self.settings.get(HTTP_VALIDATORS_SETTING)
+        try:
+            while running and not self.queue.is_closed:
+                try:
+                    worker_id, kind, payload = channel.get(timeout=self.queue.read_timeout)
+                except Empty:
+                    if not any(process.is_alive() for process in processes):
+                        logger.error("Scrapy workers exited without finishing crawling")
+                        break
+                    continue
+
+                if kind == "items":
+                    batch, urls = payload
+                    if validators and urls:
+                        validators.items_scraped(batch, urls)
+                    self.forward(batch)
+                elif kind == "validators" and validators:
+                    validators.update(payload)
+                elif kind == "done":
+                    logger.info(f"Scrapy worker {worker_id} finished")
+                    running.discard(worker_id)
+        finally:
+            # Queue is closed by pipeline so nobody waits for items anymore
+            for process in processes:
+                if process.is_alive() and self.queue.is_closed:
+                    process.terminate()
+
+            # Workers stop gracefully and can't exit before their messages are read
+            while any(process.is_alive() for process in processes):
+                try:
+                    worker_id, kind, payload = channel.get(timeout=self.queue.read_timeout)
+                except Empty:
+                    continue
+                if kind == "items" and validators:
+                    # Dropped items never reach the pipeline, their pages stay pending
+                    batch, urls = payload
+                    if urls:
+                        validators.items_scraped(batch, urls)
+                elif kind == "validators" and validators:
+                    validators.update(payload)
+
+            for process in processes:
+                process.join()
+
+            self.finished = all(process.exitcode == 0 for process in processes)
+            self.queue.close()
+            logger.info("Scraping stopped")
+
+    def worker_jobdir(self, worker_id: int) -> t.Optional[str]:
+        """Every worker keeps its own crawling state, shards depend on the number of workers"""
+        if not self.jobdir:
+            return None
+        return os.path.join(self.jobdir, f"worker_{worker_id}_of_{self.workers}")
+
+    def forward(self, batch: t.List[T]) -> None:
+        """Puts batch into the queue unless pipeline closes it meanwhile"""
+        started_at = time.perf_counter() if self.metrics else 0.0
+        while not self.queue.is_closed:
+            try:
+                self.queue.put_many(batch, timeout=self.queue.read_timeout)
+                break
+            except Full:
+                continue
+
+        if self.metrics:
+            self.metrics.items_scraped += len(batch)
+            self.metrics.put_blocked.observe(time.perf_counter() - started_at)
+
+
 class PipelineRunner(Runnable):
     """Pipeline runner runs dlt pipeline in a separate thread
     Since scrapy wants to run in the main thread it is the only available
     option to host pipeline in a thread and communicate via the queue.
     """
 
-    def __init__(self, pipeline: dlt.Pipeline, queue: ScrapingQueue[T]) -> None:
+    def __init__(
+        self,
+        pipeline: dlt.Pipeline,
+        queue: ScrapingQueue[T],
+        metrics: t.Optional[ScrapingMetrics] = None,
+        validators: t.Optional[HttpValidators] = None,
+    ) -> None:
         self.pipeline = pipeline
         self.queue = queue
+        self.metrics = metrics
+        self.validators = validators
+        self.error: t.Optional[Exception] = None
+
+        # Set once http validators are loaded from the pipeline state
+        self.state_ready = threading.Event()
+        # Set once scrapy stopped, validators are final then
+        self.crawling_stopped = threading.Event()
+        self.crawling_finished = False
 
         if pipeline.dataset_name and not self.is_default_dataset_name(pipeline):
             resource_name = pipeline.dataset_name
@@ -120,13 +512,48 @@ class PipelineRunner(Runnable):
 
         logger.info(f"Resource name: {resource_name}")
 
+        self.resource_name = resource_name
         self.scraping_resource = dlt.resource(
             # Queue get_batches is a generator so we can
             # pass it to pipeline.run and dlt will handle the rest.
-            self.queue.stream(),
+            self.stream_with_state() if validators else self.queue.stream(),
             name=resource_name,
         )
 
+    def stream_with_state(self) -> t.Iterator[t.Any]:
+        """Streams the queue and keeps http validators in the resource state
+
+        Validators from the previous run are loaded before crawling starts
+        and updated ones are stored once crawling stopped, only for pages
+        whose items were taken by dlt.
+        """
+        assert self.validators is not None
+        state = dlt.current.resource_state(self.resource_name)
+        self.validators.load(state.get(SOURCE_SCRAPY_HTTP_VALIDATORS_STATE_KEY, {}))
+        self.state_ready.set()
+        try:
+            yield from self.queue.stream(on_delivered=self.validators.delivered)
+        finally:
+            # dlt may stop taking items (i.e. `add_limit`) while scrapy still crawls,
+            # nobody takes what is left in the queue so it is dropped until scrapy stops
+            self.queue.close()
+            while not self.crawling_stopped.wait(SOURCE_SCRAPY_BACKPRESSURE_INTERVAL):
+                self.queue.drain()
+            state[SOURCE_SCRAPY_HTTP_VALIDATORS_STATE_KEY] = self.validators.snapshot(
+                self.crawling_finished
+            )
+
+    def on_crawling_stopped(self, finished: bool) -> None:
+        """Called by the host once scrapy stopped"""
+        self.crawling_finished = finished
+        self.crawling_stopped.set()
+
+    def wait_for_state(self, pipeline_worker: threading.Thread) -> None:
+        """Waits until validators are loaded or pipeline worker exits"""
+        while not self.state_ready.wait(SOURCE_SCRAPY_BACKPRESSURE_INTERVAL):
+            if not pipeline_worker.is_alive():
+                break
+
     def is_default_dataset_name(self, pipeline: dlt.Pipeline) -> bool:
         default_name = pipeline.pipeline_name + pipeline.DEFAULT_DATASET_SUFFIX
         return pipeline.dataset_name == default_name
@@ -155,8 +582,10 @@ class PipelineRunner(Runnable):
         def run() -> None:
             try:
                 self.pipeline.run(self.scraping_resource, **kwargs)  # type: ignore[arg-type]
-            except Exception:
+                self.record_steps()
+            except Exception as ex:
                 logger.error("Error during pipeline.run call, closing the queue")
+                self.error = ex
                 raise
             finally:
                 self.queue.close()
@@ -165,31 +594,135 @@ class PipelineRunner(Runnable):
         thread_runner.start()
         return thread_runner
 
+    def record_steps(self) -> None:
+        """Records durations of pipeline steps from the last trace"""
+        trace = self.pipeline.last_trace
+        if not self.metrics or not trace:
+            return
+
+        for step in trace.steps:
+            if step.started_at and step.finished_at:
+                duration = (step.finished_at - step.started_at).total_seconds()
+                self.metrics.pipeline_steps[step.step] = duration
+
 
 class ScrapingHost:
-    """Scraping host runs the pipeline and scrapy"""
+    """Scraping host runs the pipeline and scrapy
+
+    If `jobdir` is given it holds crawling state of resumable runs. Scrapy
+    crawls in a copy of it which replaces it only once dlt took and loaded
+    all scraped items, so pages whose items were not loaded (failed pipeline,
+    `add_limit` or killed process) are crawled again from the last loaded state.
+    Crawling state is removed once crawling is finished and scraped items
+    are loaded so the next run starts from start urls again.
+    """
 
     def __init__(
         self,
         queue: ScrapingQueue[T],
-        scrapy_runner: ScrapyRunner,
+        scrapy_runner: t.Union[ScrapyRunner, ShardedScrapyRunner],
         pipeline_runner: PipelineRunner,
+        jobdir: t.Optional[str] = None,
+        metrics: t.Optional[ScrapingMetrics] = None,
+        metrics_log_interval: t.Optional[float] = None,
     ) -> None:
         self.queue = queue
         self.scrapy_runner = scrapy_runner
         self.pipeline_runner = pipeline_runner
+        self.jobdir = jobdir
+        self.metrics = metrics
+        self.metrics_log_interval = metrics_log_interval
+
+    def restore_crawling_state(self) -> None:
+        """Copies crawling state of the last loaded run for scrapy"""
+        assert self.jobdir and self.scrapy_runner.jobdir
+        # Leftover of a killed run
+        shutil.rmtree(self.scrapy_runner.jobdir, ignore_errors=True)
+        if os.path.exists(self.jobdir):
+            logger.info(f"Resuming crawling from {self.jobdir}")
+            shutil.copytree(self.jobdir, self.scrapy_runner.jobdir)
+
+    def commit_crawling_state(self) -> None:
+        """Keeps crawling state of this run if all scraped items were loaded"""
+        assert self.jobdir and self.scrapy_runner.jobdir
+        if self.pipeline_runner.error is not None or not self.queue.is_exhausted:
+            logger.warning(
+                f"Scraped items were not loaded, next run resumes from {self.jobdir}"
+            )
+            shutil.rmtree(self.scrapy_runner.jobdir, ignore_errors=True)
+            return
+
+        # If the process dies in between the next run starts from start urls
+        shutil.rmtree(self.jobdir, ignore_errors=True)
+        if self.scrapy_runner.finished:
+            logger.info(f"Crawling finished, removing crawling state at {self.jobdir}")
+            shutil.rmtree(self.scrapy_runner.jobdir, ignore_errors=True)
+        else:
+            logger.info(f"Crawling was interrupted, next run resumes from {self.jobdir}")
+            os.rename(self.scrapy_runner.jobdir, self.jobdir)
+
+    def report_metrics(self, stopped: threading.Event) -> None:
+        """Samples queue depth and periodically logs metrics until stopped"""
+        assert self.metrics
+        logged_at = time.monotonic()
+        while not stopped.wait(SOURCE_SCRAPY_METRICS_SAMPLE_INTERVAL):
+            queue_depth = self.queue.qsize()
+            self.metrics.queue_depth.observe(queue_depth)
+            if (
+                self.metrics_log_interval
+                and time.monotonic() - logged_at >= self.metrics_log_interval
+            ):
+                logger.info(self.metrics.log_line(queue_depth))
+                logged_at = time.monotonic()
 
     def run(
         self,
         *args: P.args,
         **kwargs: P.kwargs,
-    ) -> None:
-        """You can pass kwargs which are passed to `pipeline.run`"""
+    ) -> t.Optional[AnyDict]:
+        """You can pass kwargs which are passed to `pipeline.run`
+
+        Returns:
+            t.Optional[AnyDict]: metrics summary if metrics are collected
+        """
+        stopped = threading.Event()
+        if self.metrics:
+            reporter = threading.Thread(
+                target=self.report_metrics,
+                args=(stopped,),
+                name="scraping_metrics",
+                daemon=True,
+            )
+            reporter.start()
+
         logger.info("Starting pipeline")
         pipeline_worker = self.pipeline_runner.run(*args, **kwargs)
 
+        # Crawler needs validators from the previous run
+        if self.pipeline_runner.validators:
+            self.pipeline_runner.wait_for_state(pipeline_worker)
+
+        if self.jobdir:
+            self.restore_crawling_state()
+
         logger.info("Starting scrapy crawler")
-        self.scrapy_runner.run()
+        try:
+            self.scrapy_runner.run()
+        finally:
+            # Pipeline stops waiting for items even if scrapy failed to start
+            self.pipeline_runner.queue.close()
+            self.pipeline_runner.on_crawling_stopped(self.scrapy_runner.finished)
 
         # Wait to for pipeline finish it's job
         pipeline_worker.join()
+        stopped.set()
+
+        if self.jobdir:
+            self.commit_crawling_state()
+
+        if not self.metrics:
+            return None
+
+        summary = self.metrics.summary()
+        logger.info(f"Scraping summary: {summary}")
+        return summary
@@ -3,6 +3,27 @@ from .types import AnyDict
 SOURCE_BATCH_SIZE: int = 10
 SOURCE_SCRAPY_QUEUE_SIZE: int = 3000
 SOURCE_SCRAPY_QUEUE_RESULT_TIMEOUT: int = 5
+# How often (in seconds) we check if paused crawling can be resumed
+SOURCE_SCRAPY_BACKPRESSURE_INTERVAL: float = 0.1
+# How many batches each scrapy worker process can have in flight to the pipeline
+SOURCE_SCRAPY_WORKER_CHANNEL_SIZE: int = 10
+# Bloom filter used to deduplicate start urls is sized for this many urls,
+# with more urls the chance to wrongly skip a unique url grows above the error rate.
+SOURCE_SCRAPY_START_URLS_DEDUP_CAPACITY: int = 5_000_000
+SOURCE_SCRAPY_START_URLS_DEDUP_ERROR_RATE: float = 0.0001
+# How often (in seconds) queue depth is sampled and metrics are logged
+SOURCE_SCRAPY_METRICS_SAMPLE_INTERVAL: float = 1.0
+SOURCE_SCRAPY_METRICS_LOG_INTERVAL: float = 60.0
+# Resource state key which keeps http validators of crawled pages
+SOURCE_SCRAPY_HTTP_VALIDATORS_STATE_KEY: str = "http_validators"
+# Priority of conditional requests middleware, it must see decompressed responses
+# so it goes before `HttpCompressionMiddleware` (590)
+SOURCE_SCRAPY_CONDITIONAL_MIDDLEWARE_PRIORITY: int = 580
+# Directory in pipeline working dir which keeps crawling state of resumable runs
+SOURCE_SCRAPY_JOBDIR: str = "scrapy_jobdir"
+# Copy of the crawling state scrapy works with, it replaces
+# the crawling state once scraped items are loaded
+SOURCE_SCRAPY_RUNNING_JOBDIR: str = "scrapy_jobdir_running"
 SOURCE_SCRAPY_SETTINGS: AnyDict = {
     "LOG_LEVEL": "INFO",
     # If not set then will keep logging warning in the console
@@ -0,0 +1,114 @@
+"""Streaming start urls provider
+
+Start urls are read lazily and deduplicated with a bloom filter
+so even huge seed files are fed to scrapy with flat memory usage.
+"""
+import hashlib
+import math
+import os
+import typing as t
+import zlib
+
+from .settings import (
+    SOURCE_SCRAPY_START_URLS_DEDUP_CAPACITY,
+    SOURCE_SCRAPY_START_URLS_DEDUP_ERROR_RATE,
+)
+
+
+class BloomFilter:
+    """Bounded memory set of strings
+
+    Membership test might give false positives with `error_rate` probability
+    as long as no more than `capacity` values were added, there are no false negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str) -> t.Iterator[int]:
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for idx in range(self.hash_count):
+            yield (h1 + idx * h2) % self.size
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, str):
+            return False
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+class StartUrls:
+    """Lazy iterable of deduplicated start urls
+
+    Merges `urls` with urls from `urls_file` (one url per line),
+    strips whitespace and skips empty lines and duplicates.
+    Every iteration reads the file again, so instances are cheap to pickle
+    and can be passed to scrapy worker processes.
+    """
+
+    def __init__(
+        self,
+        urls: t.Optional[t.List[str]] = None,
+        urls_file: t.Optional[str] = None,
+        dedup_capacity: int = SOURCE_SCRAPY_START_URLS_DEDUP_CAPACITY,
+        dedup_error_rate: float = SOURCE_SCRAPY_START_URLS_DEDUP_ERROR_RATE,
+        shard_index: int = 0,
+        shard_count: int = 1,
+    ) -> None:
+        self.urls = urls or []
+        self.urls_file = urls_file
+        self.dedup_capacity = dedup_capacity
+        self.dedup_error_rate = dedup_error_rate
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+
+    def shard(self, shard_index: int, shard_count: int) -> "StartUrls":
+        """Returns start urls which belong to the given shard
+
+        Urls are assigned to shards by stable hash so duplicates
+        always land in the same shard and are still deduplicated.
+        """
+        return StartUrls(
+            urls=self.urls,
+            urls_file=self.urls_file,
+            dedup_capacity=self.dedup_capacity,
+            dedup_error_rate=self.dedup_error_rate,
+            shard_index=shard_index,
+            shard_count=shard_count,
+        )
+
+    def read_file(self) -> t.Iterator[str]:
+        if self.urls_file and os.path.exists(self.urls_file):
+            with open(self.urls_file, encoding="utf-8") as fp:
+                yield from fp
+
+    def __iter__(self) -> t.Iterator[str]:
+        seen = BloomFilter(self.dedup_capacity, self.dedup_error_rate)
+        for urls in (self.urls, self.read_file()):
+            for url in urls:
+                url = url.strip()
+                if not url:
+                    continue
+
+                if (
+                    self.shard_count > 1
+                    and zlib.crc32(url.encode("utf-8")) % self.shard_count
+                    != self.shard_index
+                ):
+                    continue
+
+                if url in seen:
+                    continue
+
+                seen.add(url)
+                yield url
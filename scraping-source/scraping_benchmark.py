@@ -0,0 +1,56 @@
+"""Measures how fast scraped items travel through `ScrapingQueue`
+
+Producer thread plays the role of scrapy and puts items into the queue
+while the main thread consumes batches same way the dlt resource does.
+
+    python scraping_benchmark.py
+"""
+import threading
+import time
+import typing as t
+
+from scraping.queue import ScrapingQueue
+from scraping.settings import SOURCE_SCRAPY_QUEUE_SIZE
+
+ITEMS_COUNT = 200_000
+BATCH_SIZE = 100
+
+
+def produce(queue: ScrapingQueue[t.Any], items_count: int) -> None:
+    for idx in range(items_count):
+        item = {"quote": {"text": f"quote {idx}", "author": "author", "tags": []}}
+        if queue.batch_handoff:
+            queue.put_buffered(item)
+        else:
+            queue.put(item)
+
+    queue.flush()
+    queue.join()
+    queue.close()
+
+
+def measure(batch_handoff: bool, items_count: int = ITEMS_COUNT) -> float:
+    """Returns the number of items per second which went through the queue"""
+    queue: ScrapingQueue[t.Any] = ScrapingQueue(
+        maxsize=SOURCE_SCRAPY_QUEUE_SIZE,
+        batch_size=BATCH_SIZE,
+        read_timeout=0.1,
+        batch_handoff=batch_handoff,
+    )
+    producer = threading.Thread(target=produce, args=(queue, items_count))
+
+    started_at = time.perf_counter()
+    producer.start()
+    consumed = sum(len(batch) for batch in queue.stream())
+    producer.join()
+    elapsed = time.perf_counter() - started_at
+
+    assert consumed == items_count, f"Expected {items_count} items, got {consumed}"
+    return consumed / elapsed
+
+
+if __name__ == "__main__":
+    per_item = measure(batch_handoff=False)
+    batched = measure(batch_handoff=True)
+    print(f"per item handoff: {per_item:,.0f} items/sec")
+    print(f"batch handoff:    {batched:,.0f} items/sec ({batched / per_item:.1f}x)")
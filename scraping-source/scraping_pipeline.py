@@ -99,8 +99,25 @@ def scrape_quotes_advanced_runner() -> None:
     scraping_host.run(dataset_name="quotes", write_disposition="append")
 
 
+def scrape_quotes_multiple_workers() -> None:
+    pipeline = dlt.pipeline(
+        pipeline_name="scraping_multiple_workers",
+        destination='duckdb',
+        dataset_name="quotes",
+    )
+
+    run_pipeline(
+        pipeline,
+        MySpider,
+        # start urls are sharded across worker processes
+        workers=2,
+        write_disposition="append",
+    )
+
+
 if __name__ == "__main__":
     scrape_quotes()
     # scrape_quotes_scrapy_configs()
     # scrape_quotes_callback_access_resource()
     # scrape_quotes_advanced_runner()
+    # scrape_quotes_multiple_workers()
@@ -0,0 +1,146 @@
+import threading
+import time
+import typing as t
+from queue import Empty, Full
+
+import pytest
+
+from scraping.queue import ScrapingQueue, group_items_by_table
+
+
+class Quote:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+def fill(queue: ScrapingQueue[t.Any], items: t.List[t.Any]) -> ScrapingQueue[t.Any]:
+    queue.put_many(items)
+    queue.close()
+    return queue
+
+
+@pytest.mark.parametrize("batch_handoff", [False, True], ids=["items", "handoff"])
+def test_closed_queue_is_drained_in_batches(batch_handoff: bool) -> None:
+    queue = fill(ScrapingQueue(batch_size=3, read_timeout=0.01, batch_handoff=batch_handoff), list(range(8)))
+
+    assert list(queue.get_batches()) == [[0, 1, 2], [3, 4, 5], [6, 7]]
+    assert queue.unfinished_tasks == 0
+
+
+def test_buffered_items_are_handed_over_in_chunks() -> None:
+    queue: ScrapingQueue[int] = ScrapingQueue(batch_size=3)
+    for item in range(4):
+        queue.put_buffered(item)
+    assert queue.qsize() == 3
+
+    queue.flush()
+    assert queue.qsize() == 4
+
+
+def test_offer_keeps_items_while_queue_is_full() -> None:
+    queue: ScrapingQueue[int] = ScrapingQueue(maxsize=2, batch_size=2, batch_handoff=True)
+    assert queue.offer(0)
+    assert queue.offer(1)
+    # buffered until a chunk is full, then handing it over fails
+    assert queue.offer(2)
+    assert not queue.offer(3)
+    assert queue.qsize() == 2
+
+    assert queue.get_many(10) == [0, 1]
+    assert queue.flush(block=False)
+    assert queue.get_many(10) == [2, 3]
+
+
+def test_put_many_overshoots_by_one_chunk() -> None:
+    queue: ScrapingQueue[int] = ScrapingQueue(maxsize=2)
+    queue.put_many([0])
+    queue.put_many([1, 2, 3])
+    assert queue.qsize() == 4
+    with pytest.raises(Full):
+        queue.put_many([4], block=False)
+    with pytest.raises(Full):
+        queue.put_many([4], timeout=0.01)
+
+
+def test_get_many_marks_items_done() -> None:
+    queue: ScrapingQueue[int] = ScrapingQueue()
+    queue.put_many([0, 1, 2])
+    assert queue.get_many(2) == [0, 1]
+    assert queue.get_many(2) == [2]
+    # join returns right away, producers are not held back
+    queue.join()
+    with pytest.raises(Empty):
+        queue.get_many(1, timeout=0.01)
+
+
+def test_batch_is_flushed_at_byte_limit() -> None:
+    queue = fill(ScrapingQueue(max_batch_items=100, max_batch_bytes=10, read_timeout=0.01), ["abcd"] * 5)
+
+    assert list(queue.get_batches()) == [["abcd"] * 3, ["abcd"] * 2]
+
+
+def test_batch_is_flushed_after_latency() -> None:
+    queue: ScrapingQueue[int] = ScrapingQueue(max_batch_items=100, max_batch_latency=0.1, read_timeout=10)
+    batches = queue.get_batches()
+
+    def produce() -> None:
+        for item in range(10):
+            queue.put(item)
+            time.sleep(0.03)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    started_at = time.monotonic()
+    first = next(batches)
+    # flushed by latency long before read_timeout, while items still arrive
+    assert time.monotonic() - started_at < 1.0
+    assert 0 < len(first) < 10
+    producer.join()
+    queue.close()
+    assert first + [item for batch in batches for item in batch] == list(range(10))
+
+
+def test_stream_exhausts_closed_queue() -> None:
+    queue = fill(ScrapingQueue(batch_size=2, read_timeout=0.01), [1, 2, 3])
+    delivered: t.List[int] = []
+
+    assert list(queue.stream(on_delivered=delivered.extend)) == [[1, 2], [3]]
+    assert delivered == [1, 2, 3]
+    assert queue.is_exhausted
+
+
+def test_stream_closed_by_consumer_is_not_exhausted() -> None:
+    queue: ScrapingQueue[int] = ScrapingQueue(batch_size=2, read_timeout=0.01)
+    queue.put_many([1, 2, 3])
+    stream = queue.stream()
+
+    assert next(stream) == [1, 2]
+    # dlt stops early, e.g. with add_limit
+    stream.close()
+    assert queue.is_closed
+    assert not queue.is_exhausted
+    assert queue.drain() == 1
+    queue.join()
+
+
+def test_items_are_routed_to_tables() -> None:
+    quote = Quote("hi")
+    items = [{"__table__": "authors", "name": "a"}, quote, {"name": "b"}, {"__table__": "authors", "name": "c"}]
+
+    assert group_items_by_table(items) == {
+        "authors": [{"name": "a"}, {"name": "c"}],
+        "Quote": [quote],
+        None: [{"name": "b"}],
+    }
+
+
+def test_stream_marks_routed_batches_with_table_name() -> None:
+    queue = fill(
+        ScrapingQueue(batch_size=10, read_timeout=0.01, route_items=True),
+        [{"__table__": "authors", "name": "a"}, {"name": "b"}],
+    )
+
+    batches = list(queue.stream())
+    assert batches[0].meta.table_name == "authors"
+    assert batches[0].data == [{"name": "a"}]
+    assert batches[1] == [{"name": "b"}]